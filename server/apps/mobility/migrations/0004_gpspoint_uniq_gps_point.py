@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobility', '0003_migrate_tdrive_to_generic'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='gpspoint',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='gpspoint',
+            constraint=models.UniqueConstraint(fields=('dataset', 'entity_id', 'timestamp'), name='uniq_gps_point'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-15 09:40
+
+import apps.mobility.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobility', '0004_gpspoint_uniq_gps_point'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gpspoint',
+            name='extra_attributes',
+            field=models.JSONField(blank=True, default=dict, encoder=apps.mobility.models.FastJSONEncoder, help_text='Additional dataset-specific attributes'),
+        ),
+        migrations.AlterField(
+            model_name='gpspoint',
+            name='validation_flags',
+            field=models.JSONField(blank=True, default=dict, encoder=apps.mobility.models.FastJSONEncoder, help_text='Validation issues (if any)'),
+        ),
+    ]
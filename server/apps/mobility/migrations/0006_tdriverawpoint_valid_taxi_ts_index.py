@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-15 11:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobility', '0005_gpspoint_fast_json_encoder'),
+    ]
+
+    # TDriveRawPoint is unmanaged, so the partial index is created directly
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS idx_tdrive_valid_taxi_ts "
+                "ON mobility_tdriverawpoint (taxi_id, timestamp) "
+                "WHERE is_valid"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS idx_tdrive_valid_taxi_ts",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobility', '0006_tdriverawpoint_valid_taxi_ts_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='successful_records',
+            field=models.IntegerField(default=0, help_text='Successfully imported (points already present count as successful)'),
+        ),
+    ]
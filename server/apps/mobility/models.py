@@ -12,8 +12,41 @@ from django.contrib.gis.db import models as gis_models
 from django.db import models
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.serializers.json import DjangoJSONEncoder
+import logging
 import uuid
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available - JSON fields will use the stdlib encoder")
+
+
+# ============================================================================
+# JSON Encoding
+# ============================================================================
+
+class FastJSONEncoder(DjangoJSONEncoder):
+    """
+    JSONField encoder backed by orjson when it is installed.
+    
+    Per-point JSON columns are usually empty, so {} is returned without
+    calling into any encoder. Values orjson rejects (e.g. non-string keys)
+    fall back to the stdlib path.
+    """
+    
+    def encode(self, o):
+        if isinstance(o, dict) and not o:
+            return '{}'
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(o).decode()
+            except TypeError:
+                pass
+        return super().encode(o)
+
 
 # ============================================================================
 # Core Mobility Models
@@ -185,6 +218,7 @@ class GPSPoint(gis_models.Model):
     # Extended attributes (JSON for flexibility)
     extra_attributes = models.JSONField(
         default=dict,
+        encoder=FastJSONEncoder,
         blank=True,
         help_text="Additional dataset-specific attributes"
     )
@@ -197,6 +231,7 @@ class GPSPoint(gis_models.Model):
     )
     validation_flags = models.JSONField(
         default=dict,
+        encoder=FastJSONEncoder,
         blank=True,
         help_text="Validation issues (if any)"
     )
@@ -217,8 +252,13 @@ class GPSPoint(gis_models.Model):
             models.Index(fields=['dataset', 'timestamp'], name='idx_gps_dataset_time'),
             models.Index(fields=['entity_id', 'timestamp'], name='idx_gps_entity_time'),
         ]
-        # Prevent duplicate points
-        unique_together = [['dataset', 'entity_id', 'timestamp']]
+        constraints = [
+            # Prevent duplicate points; also the conflict target for bulk imports
+            models.UniqueConstraint(
+                fields=['dataset', 'entity_id', 'timestamp'],
+                name='uniq_gps_point'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.entity_id} @ {self.timestamp}"
@@ -399,7 +439,7 @@ class ImportJob(models.Model):
     )
     successful_records = models.IntegerField(
         default=0,
-        help_text="Successfully imported"
+        help_text="Successfully imported (points already present count as successful)"
     )
     failed_records = models.IntegerField(
         default=0,
@@ -531,6 +571,14 @@ class TDriveRawPoint(gis_models.Model):
     class Meta:
         db_table = 'mobility_tdriverawpoint'
         managed = False  # Don't create/modify during migrations
+        # Not tracked by migrations for unmanaged models; created in 0006 via RunSQL
+        indexes = [
+            models.Index(
+                fields=['taxi_id', 'timestamp'],
+                condition=models.Q(is_valid=True),
+                name='idx_tdrive_valid_taxi_ts'
+            ),
+        ]
 
 
 class TDriveTrajectory(gis_models.Model):
@@ -167,6 +167,17 @@ class GPSPointCreateSerializer(serializers.ModelSerializer):
         return data
 
 
+class GPSPointBulkItemSerializer(GPSPointCreateSerializer):
+    """
+    Serializer for one point of a bulk upload.
+    The dataset is given once for the whole batch, so it is not a field:
+    no per-point dataset lookup and no per-point uniqueness query.
+    """
+    
+    class Meta(GPSPointCreateSerializer.Meta):
+        fields = [f for f in GPSPointCreateSerializer.Meta.fields if f != 'dataset']
+
+
 # ============================================================================
 # Trajectory Serializers
 # ============================================================================
@@ -0,0 +1,118 @@
+"""
+============================================================================
+Numba kernels for trajectory analysis
+============================================================================
+Description: Compiled Haversine and stop-scan loops used by the trajectory
+            analyzer. Everything here is optional: callers check
+            NUMBA_AVAILABLE and keep a NumPy path when it is False.
+============================================================================
+"""
+import math
+import warnings
+
+import numpy as np
+
+warnings.filterwarnings('once', category=ImportWarning, module=__name__)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    warnings.warn("numba not available", ImportWarning)
+
+
+EARTH_RADIUS_KM = 6371.0
+
+# Above this many points the per-stop medoid search runs on all cores
+PARALLEL_THRESHOLD = 50_000
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _haversine(rlat1, rlon1, rlat2, rlon2):
+        """Great-circle distance in km between two points given in radians."""
+        a = (math.sin((rlat2 - rlat1) * 0.5) ** 2 +
+             math.cos(rlat1) * math.cos(rlat2) * math.sin((rlon2 - rlon1) * 0.5) ** 2)
+        return 2.0 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+    
+    @njit(cache=True, fastmath=True)
+    def _scan_windows(rlat, rlon, t_seconds, dt, ds):
+        """Sequential diameter scan; returns inclusive (start, end) index arrays."""
+        n = rlat.shape[0]
+        starts = np.empty(n, dtype=np.int64)
+        ends = np.empty(n, dtype=np.int64)
+        count = 0
+        left = 0
+        right = 0
+        
+        while left < n - 1:
+            while right + 1 < n:
+                fits = True
+                for k in range(left, right + 1):
+                    if _haversine(rlat[right + 1], rlon[right + 1], rlat[k], rlon[k]) > ds:
+                        fits = False
+                        break
+                if not fits:
+                    break
+                right += 1
+            
+            if t_seconds[right] - t_seconds[left] >= dt:
+                starts[count] = left
+                ends[count] = right
+                count += 1
+                left = right + 1
+                right = left
+            elif right == n - 1:
+                break
+            else:
+                left += 1
+                if left > right:
+                    right = left
+        
+        return starts[:count], ends[:count]
+    
+    def _stop_medoids(rlat, rlon, lat, lon, starts, ends, out_lat, out_lon):
+        """Write the medoid of every [start, end] window into out_lat/out_lon."""
+        for s in prange(starts.shape[0]):
+            lo = starts[s]
+            hi = ends[s] + 1
+            best = lo
+            best_total = np.inf
+            for i in range(lo, hi):
+                total = 0.0
+                for j in range(lo, hi):
+                    total += _haversine(rlat[i], rlon[i], rlat[j], rlon[j])
+                if total < best_total:
+                    best_total = total
+                    best = i
+            out_lat[s] = lat[best]
+            out_lon[s] = lon[best]
+    
+    # Same body compiled twice; the parallel build is not cached on disk so
+    # the two dispatchers never share a cache entry
+    _stop_medoids_serial = njit(cache=True, fastmath=True)(_stop_medoids)
+    _stop_medoids_parallel = njit(fastmath=True, parallel=True)(_stop_medoids)
+    
+    def stop_scan(lat, lon, t_seconds, dt, ds):
+        """
+        Diameter-based stop detection on contiguous float64/int64 arrays.
+        
+        Args:
+            lat, lon: Coordinates in degrees, ordered by time
+            t_seconds: Epoch seconds (int64)
+            dt: Minimum stop duration in seconds
+            ds: Maximum stop diameter in km
+        
+        Returns:
+            Tuple (start_idx, end_idx, medoid_lat, medoid_lon)
+        """
+        rlat = np.radians(lat)
+        rlon = np.radians(lon)
+        starts, ends = _scan_windows(rlat, rlon, t_seconds, dt, ds)
+        
+        medoid_lat = np.empty(starts.shape[0])
+        medoid_lon = np.empty(starts.shape[0])
+        medoids = _stop_medoids_parallel if lat.shape[0] > PARALLEL_THRESHOLD else _stop_medoids_serial
+        medoids(rlat, rlon, lat, lon, starts, ends, medoid_lat, medoid_lon)
+        return starts, ends, medoid_lat, medoid_lon
@@ -1,10 +1,10 @@
 """
 ============================================================================
-Generic Mobility Data Importer - FIXED v2
+Generic Mobility Data Importer
 ============================================================================
-Key fixes:
-1. Fixed bulk_create to not use ignore_conflicts (doesn't return created objects)
-2. Use get_or_create for each point individually
+Key points:
+1. Points are written with bulk_create(ignore_conflicts=True)
+2. Duplicates are rejected by the uniq_gps_point constraint, no pre-SELECT
 3. Better tracking of successful/failed insertions
 ============================================================================
 """
@@ -15,6 +15,8 @@ import json
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
+import numpy as np
+import pandas as pd
 from django.contrib.gis.geos import Point
 from django.db import transaction, IntegrityError
 from django.utils import timezone
@@ -28,6 +30,152 @@ from apps.mobility.models import (
 
 logger = logging.getLogger(__name__)
 
+# Read buffer for file ingest (1 MB amortises read() syscalls on large files)
+READ_BUFFER_SIZE = 1 << 20
+
+
+def _open_for_ingest(file_path: str):
+    """
+    Open a text file for sequential ingest.
+    
+    Uses a large read buffer and, where the platform supports it, advises
+    the kernel that the file is read sequentially so it widens read-ahead.
+    """
+    f = open(file_path, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE)
+    
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    
+    return f
+
+
+def _compile_row_parser(
+    header: List[str],
+    field_mapping: Dict[str, str]
+) -> Tuple[List[str], Any]:
+    """
+    Generate a row parser specialised for one CSV header and field mapping.
+    
+    Equivalent to _apply_field_mapping over a DictReader row, but the column
+    indices are resolved once and baked into the generated code. Each row
+    becomes a positional tuple, so no per-row dict is built for the mapped
+    fields; only unmapped columns are gathered into extra_attributes.
+    
+    Args:
+        header: Column names from the first CSV row
+        field_mapping: Standard field -> source column mapping
+    
+    Returns:
+        (columns, parse): names of the tuple positions, and a function taking
+        a csv.reader row (list) and returning the mapped tuple
+    """
+    idx = {name: i for i, name in enumerate(header)}
+    mapped = {
+        standard: idx[source]
+        for standard, source in field_mapping.items()
+        if source in idx
+    }
+    mapped_sources = set(field_mapping.values())
+    
+    columns = list(mapped)
+    fields = [f"row[{i}]" for i in mapped.values()]
+    extras = [
+        f"{name!r}: row[{i}]"
+        for name, i in idx.items()
+        if name not in mapped_sources and name not in mapped
+    ]
+    if extras:
+        columns.append('extra_attributes')
+        fields.append(f"{{{', '.join(extras)}}}")
+    
+    src = f"def parse(row):\n    return ({''.join(f + ', ' for f in fields)})\n"
+    ns = {}
+    exec(src, ns)
+    return columns, ns['parse']
+
+
+class _PointBatch:
+    """
+    Column-oriented buffer for validated points awaiting insertion.
+    
+    Each column is a list preallocated to the batch capacity and filled by
+    position, so a batch costs a handful of lists instead of one dict per
+    row. clear() only rewinds the cursor; slots are overwritten on reuse.
+    """
+    
+    __slots__ = (
+        'capacity', 'size', 'record_number', 'entity_id', 'timestamp',
+        'longitude', 'latitude', 'speed', 'extra_attributes'
+    )
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.record_number = [None] * capacity
+        self.entity_id = [None] * capacity
+        self.timestamp = [None] * capacity
+        self.longitude = [None] * capacity
+        self.latitude = [None] * capacity
+        self.speed = [None] * capacity
+        self.extra_attributes = [None] * capacity
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    @property
+    def full(self) -> bool:
+        return self.size >= self.capacity
+    
+    def append(
+        self,
+        entity_id: str,
+        timestamp: datetime,
+        longitude: float,
+        latitude: float,
+        speed: Optional[float] = None,
+        extra_attributes: Optional[Dict] = None,
+        record_number: Optional[int] = None
+    ) -> None:
+        i = self.size
+        self.record_number[i] = record_number
+        self.entity_id[i] = entity_id
+        self.timestamp[i] = timestamp
+        self.longitude[i] = longitude
+        self.latitude[i] = latitude
+        self.speed[i] = speed
+        self.extra_attributes[i] = extra_attributes
+        self.size = i + 1
+    
+    def clear(self) -> None:
+        self.size = 0
+    
+    def to_models(self, dataset: Dataset) -> List[GPSPoint]:
+        """Materialise the filled rows as unsaved GPSPoint instances."""
+        n = self.size
+        return [
+            # bulk_create bypasses GPSPoint.save(), so build geom here
+            GPSPoint(
+                dataset=dataset,
+                entity_id=entity_id,
+                timestamp=timestamp,
+                longitude=lon,
+                latitude=lat,
+                geom=Point(lon, lat, srid=4326),
+                speed=speed,
+                extra_attributes=extra or {},
+                is_valid=True,
+                validation_flags={}
+            )
+            for entity_id, timestamp, lon, lat, speed, extra in zip(
+                self.entity_id[:n], self.timestamp[:n],
+                self.longitude[:n], self.latitude[:n],
+                self.speed[:n], self.extra_attributes[:n]
+            )
+        ]
+
 
 # ============================================================================
 # Data Validators (unchanged)
@@ -36,6 +184,14 @@ logger = logging.getLogger(__name__)
 class DataValidator:
     """Validates GPS and mobility data against quality rules."""
     
+    TIMESTAMP_FORMATS = [
+        '%Y-%m-%d %H:%M:%S',
+        '%Y-%m-%dT%H:%M:%S',
+        '%Y-%m-%d %H:%M:%S.%f',
+        '%d/%m/%Y %H:%M:%S',
+        '%m/%d/%Y %H:%M:%S',
+    ]
+    
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
         self.strict_mode = self.config.get('strict_mode', False)
@@ -62,15 +218,7 @@ class DataValidator:
             return (True, timestamp, "")
         
         if isinstance(timestamp, str):
-            formats = [
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%d %H:%M:%S.%f',
-                '%d/%m/%Y %H:%M:%S',
-                '%m/%d/%Y %H:%M:%S',
-            ]
-            
-            for fmt in formats:
+            for fmt in self.TIMESTAMP_FORMATS:
                 try:
                     dt = datetime.strptime(timestamp, fmt)
                     return (True, dt, "")
@@ -145,6 +293,88 @@ class DataValidator:
             result['errors'].extend(result['warnings'])
         
         return (is_valid, result)
+    
+    def validate_chunk(
+        self,
+        df: pd.DataFrame
+    ) -> Tuple[pd.Series, pd.DataFrame, pd.DataFrame]:
+        """
+        Validate a chunk of raw GPS rows in one vectorized pass.
+        
+        Applies the same rules as validate_gps_point column-wise. Rows the
+        vectorized checks reject are re-run through validate_gps_point, which
+        supplies the error messages and keeps the two paths in agreement.
+        
+        Args:
+            df: Raw rows with longitude, latitude, timestamp (and optionally
+                speed) columns
+        
+        Returns:
+            (mask, parsed, errors): boolean Series of valid rows, DataFrame of
+            parsed longitude/latitude/timestamp/speed, and DataFrame with an
+            'error' message column indexed by the rejected rows
+        """
+        missing = pd.Series(None, index=df.index, dtype=object)
+        lon_raw = df['longitude'] if 'longitude' in df else missing
+        lat_raw = df['latitude'] if 'latitude' in df else missing
+        ts_raw = df['timestamp'] if 'timestamp' in df else missing
+        
+        lon = pd.to_numeric(lon_raw, errors='coerce')
+        lat = pd.to_numeric(lat_raw, errors='coerce')
+        mask = lon.between(-180, 180) & lat.between(-90, 90)
+        if self.coordinate_bounds:
+            min_lon, min_lat, max_lon, max_lat = self.coordinate_bounds
+            mask &= lon.between(min_lon, max_lon) & lat.between(min_lat, max_lat)
+        
+        # Same format precedence as validate_timestamp; each pass only
+        # parses the rows still unresolved
+        ts = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+        pending = ts_raw.notna()
+        for fmt in self.TIMESTAMP_FORMATS:
+            if not pending.any():
+                break
+            parsed_ts = pd.to_datetime(
+                ts_raw[pending], errors='coerce', format=fmt, cache=True
+            )
+            ts[pending] = parsed_ts
+            pending &= ts.isna()
+        mask &= ts.notna()
+        
+        speed = pd.Series(np.nan, index=df.index)
+        if 'speed' in df:
+            speed_raw = df['speed']
+            speed = pd.to_numeric(speed_raw, errors='coerce')
+            out_of_range = (speed < 0) | (speed > self.speed_threshold)
+            if self.strict_mode:
+                mask &= ~((speed_raw.notna() & speed.isna()) | out_of_range)
+            speed = speed.mask(out_of_range)
+        
+        parsed = pd.DataFrame({
+            'longitude': lon,
+            'latitude': lat,
+            'timestamp': ts,
+            'speed': speed
+        })
+        
+        # Rejects are rare: let the scalar validator explain them
+        error_index = []
+        error_messages = []
+        for label in df.index[~mask.to_numpy()]:
+            row = df.loc[label].to_dict()
+            is_valid, result = self.validate_gps_point(row)
+            if is_valid:
+                values = result['parsed_data']
+                parsed.loc[label, ['longitude', 'latitude', 'timestamp']] = [
+                    values['longitude'], values['latitude'], values['timestamp']
+                ]
+                parsed.loc[label, 'speed'] = values.get('speed', np.nan)
+                mask[label] = True
+            else:
+                error_index.append(label)
+                error_messages.append('; '.join(result['errors']))
+        
+        errors = pd.DataFrame({'error': error_messages}, index=error_index)
+        return mask, parsed, errors
 
 
 # ============================================================================
@@ -220,55 +450,113 @@ class MobilityDataImporter:
         
         return mapped_data
     
-    def _save_point(self, point_data: Dict) -> Tuple[bool, str]:
+    def _bulk_save_points(self, batch: _PointBatch) -> Tuple[int, int]:
         """
-        FIX: Save a single point using get_or_create to handle duplicates.
+        Save a batch of points with a single bulk INSERT and rewind it.
+        
+        Duplicates are skipped by the uniq_gps_point constraint
+        (ON CONFLICT DO NOTHING), so no per-row SELECT is needed. As with
+        the previous get_or_create path, a point that already exists counts
+        as successful: successful_records is "stored or already present".
+        
+        The INSERT runs in a savepoint. If it fails (one bad row fails the
+        whole statement), the batch is retried row by row so that only the
+        offending rows fail, each with a ValidationError record.
         
         Returns:
-            (success, error_message)
+            (successful_count, failed_count)
         """
+        if not len(batch):
+            return 0, 0
+        
+        objs = batch.to_models(self.dataset)
+        record_numbers = batch.record_number[:len(batch)]
+        batch.clear()
+        
         try:
-            # Use get_or_create to handle duplicates gracefully
-            gps_point, created = GPSPoint.objects.get_or_create(
-                dataset=self.dataset,
-                entity_id=point_data['entity_id'],
-                timestamp=point_data['timestamp'],
-                defaults={
-                    'longitude': point_data['longitude'],
-                    'latitude': point_data['latitude'],
-                    'speed': point_data.get('speed'),
-                    'heading': point_data.get('heading'),
-                    'altitude': point_data.get('altitude'),
-                    'accuracy': point_data.get('accuracy'),
-                    'extra_attributes': point_data.get('extra_attributes', {}),
-                    'is_valid': point_data.get('is_valid', True),
-                    'validation_flags': point_data.get('validation_flags', {})
-                }
-            )
-            return (True, "")
+            with transaction.atomic():
+                GPSPoint.objects.bulk_create(
+                    objs,
+                    batch_size=self.batch_size,
+                    ignore_conflicts=True
+                )
+            return len(objs), 0
         except Exception as e:
-            return (False, str(e))
-    
-    def _bulk_save_points(self, points_data: List[Dict]) -> Tuple[int, int]:
-        """
-        FIX: Save points individually to handle duplicates properly.
+            logger.warning(f"Bulk insert failed, retrying row by row: {e}")
         
-        Returns:
-            (successful_count, failed_count)
-        """
         successful = 0
         failed = 0
-        
-        for point_data in points_data:
-            success, error = self._save_point(point_data)
-            if success:
+        for record_number, obj in zip(record_numbers, objs):
+            try:
+                with transaction.atomic():
+                    GPSPoint.objects.bulk_create([obj], ignore_conflicts=True)
                 successful += 1
-            else:
+            except Exception as e:
                 failed += 1
-                logger.debug(f"Failed to save point: {error}")
+                self.log_validation_error(
+                    record_number=record_number or 0,
+                    error_type='database_error',
+                    error_message=str(e),
+                    raw_data=f"{obj.entity_id},{obj.timestamp},{obj.longitude},{obj.latitude}"
+                )
         
         return successful, failed
     
+    def _save_job_progress(self, job: ImportJob) -> None:
+        """Persist only the progress counters of a running import job."""
+        ImportJob.objects.filter(pk=job.pk).update(
+            processed_records=job.processed_records,
+            successful_records=job.successful_records,
+            failed_records=job.failed_records
+        )
+    
+    def _process_csv_chunk(
+        self,
+        job: ImportJob,
+        mapped_rows: List[Tuple],
+        raw_rows: List[List[str]],
+        first_record: int,
+        delimiter: str,
+        points_buffer: _PointBatch
+    ) -> None:
+        """Validate a chunk of mapped CSV rows and buffer the valid ones."""
+        chunk = pd.DataFrame.from_records(mapped_rows, columns=self._row_columns)
+        mask, parsed, errors = self.validator.validate_chunk(chunk)
+        
+        n = len(chunk)
+        entity_ids = chunk['entity_id'].tolist() if 'entity_id' in chunk else ['unknown'] * n
+        extras = chunk['extra_attributes'].tolist() if 'extra_attributes' in chunk else [None] * n
+        lon = parsed['longitude'].tolist()
+        lat = parsed['latitude'].tolist()
+        ts = parsed['timestamp'].tolist()
+        speed = parsed['speed'].tolist()
+        
+        for pos in np.flatnonzero(mask.to_numpy()):
+            points_buffer.append(
+                entity_ids[pos],
+                ts[pos],
+                lon[pos],
+                lat[pos],
+                None if speed[pos] != speed[pos] else speed[pos],
+                extras[pos],
+                record_number=first_record + pos
+            )
+            if points_buffer.full:
+                successful, failed = self._bulk_save_points(points_buffer)
+                job.successful_records += successful
+                job.failed_records += failed
+                self._save_job_progress(job)
+        
+        for pos, message in errors['error'].items():
+            self.log_validation_error(
+                record_number=first_record + pos,
+                error_type='validation_failed',
+                error_message=message,
+                raw_data=delimiter.join(v or '' for v in raw_rows[pos])
+            )
+        job.failed_records += len(errors)
+        job.processed_records += n
+    
     def import_from_csv(
         self,
         file_path: str,
@@ -278,7 +566,6 @@ class MobilityDataImporter:
         config = config or {}
         field_mapping = config.get('field_mapping', {})
         delimiter = config.get('delimiter', ',')
-        skip_header = config.get('skip_header', True)
         
         if 'validation' in config:
             self.configure_validator(config['validation'])
@@ -290,55 +577,49 @@ class MobilityDataImporter:
         job.started_at = timezone.now()
         job.save()
         
-        points_buffer = []
+        points_buffer = _PointBatch(self.batch_size)
         record_count = 0
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f, delimiter=delimiter)
+            with _open_for_ingest(file_path) as f:
+                reader = csv.reader(f, delimiter=delimiter)
                 
-                if skip_header:
-                    next(reader, None)
+                # First row is always the header (as with DictReader)
+                header = next(reader, None) or []
+                n_columns = len(header)
+                self._row_columns, self._parse_row = _compile_row_parser(
+                    header,
+                    field_mapping or {name: name for name in header}
+                )
                 
-                for i, row in enumerate(reader, start=1):
-                    record_count = i
-                    
-                    if field_mapping:
-                        mapped_data = self._apply_field_mapping(row, field_mapping)
-                    else:
-                        mapped_data = row
+                mapped_rows = []
+                raw_rows = []
+                for row in reader:
+                    if not row:
+                        continue
+                    record_count += 1
                     
-                    is_valid, validation_result = self.validator.validate_gps_point(mapped_data)
+                    if len(row) < n_columns:
+                        row = row + [None] * (n_columns - len(row))
+                    mapped_rows.append(self._parse_row(row))
+                    raw_rows.append(row)
                     
-                    if is_valid:
-                        point_data = {
-                            'entity_id': mapped_data.get('entity_id', 'unknown'),
-                            'timestamp': validation_result['parsed_data']['timestamp'],
-                            'longitude': validation_result['parsed_data']['longitude'],
-                            'latitude': validation_result['parsed_data']['latitude'],
-                            'speed': validation_result['parsed_data'].get('speed'),
-                            'extra_attributes': mapped_data.get('extra_attributes', {}),
-                            'is_valid': True
-                        }
-                        points_buffer.append(point_data)
-                    else:
-                        self.log_validation_error(
-                            record_number=i,
-                            error_type='validation_failed',
-                            error_message='; '.join(validation_result['errors']),
-                            raw_data=str(row)
+                    # Validate and buffer one chunk at a time
+                    if len(mapped_rows) >= self.batch_size:
+                        self._process_csv_chunk(
+                            job, mapped_rows, raw_rows,
+                            record_count - len(mapped_rows) + 1,
+                            delimiter, points_buffer
                         )
-                        job.failed_records += 1
-                    
-                    job.processed_records += 1
-                    
-                    # Process batch
-                    if len(points_buffer) >= self.batch_size:
-                        successful, failed = self._bulk_save_points(points_buffer)
-                        job.successful_records += successful
-                        job.failed_records += failed
-                        points_buffer = []
-                        job.save()
+                        mapped_rows = []
+                        raw_rows = []
+                
+                if mapped_rows:
+                    self._process_csv_chunk(
+                        job, mapped_rows, raw_rows,
+                        record_count - len(mapped_rows) + 1,
+                        delimiter, points_buffer
+                    )
                 
                 # Process remaining
                 if points_buffer:
@@ -382,11 +663,11 @@ class MobilityDataImporter:
         job.started_at = timezone.now()
         job.save()
         
-        points_buffer = []
+        points_buffer = _PointBatch(self.batch_size)
         record_count = 0
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with _open_for_ingest(file_path) as f:
                 for i, line in enumerate(f, start=1):
                     record_count = i
                     line = line.strip()
@@ -417,14 +698,14 @@ class MobilityDataImporter:
                         is_valid, validation_result = self.validator.validate_gps_point(data)
                         
                         if is_valid:
-                            point_data = {
-                                'entity_id': data['entity_id'],
-                                'timestamp': validation_result['parsed_data']['timestamp'],
-                                'longitude': validation_result['parsed_data']['longitude'],
-                                'latitude': validation_result['parsed_data']['latitude'],
-                                'is_valid': True
-                            }
-                            points_buffer.append(point_data)
+                            parsed = validation_result['parsed_data']
+                            points_buffer.append(
+                                data['entity_id'],
+                                parsed['timestamp'],
+                                parsed['longitude'],
+                                parsed['latitude'],
+                                record_number=i
+                            )
                         else:
                             self.log_validation_error(
                                 record_number=i,
@@ -445,12 +726,11 @@ class MobilityDataImporter:
                     
                     job.processed_records += 1
                     
-                    if len(points_buffer) >= self.batch_size:
+                    if points_buffer.full:
                         successful, failed = self._bulk_save_points(points_buffer)
                         job.successful_records += successful
                         job.failed_records += failed
-                        points_buffer = []
-                        job.save()
+                        self._save_job_progress(job)
             
             if points_buffer:
                 successful, failed = self._bulk_save_points(points_buffer)
@@ -47,6 +47,62 @@ from django.contrib.gis.geos import Point
 from apps.mobility.models import TDriveRawPoint
 
 
+def _haversine_km(lat1: np.ndarray, lon1: np.ndarray,
+                  lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Haversine distance in kilometers.
+    
+    Computes in the dtype of the inputs: constants are Python floats so
+    float32 arrays stay float32.
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat/2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2.0)**2
+    c = 2.0 * np.arctan2(np.sqrt(a), np.sqrt(1.0-a))
+    return 6371.0 * c  # Earth radius in km
+
+
+def _segment_speeds_kmh(t: np.ndarray, lat: np.ndarray,
+                        lng: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Distances and speeds between consecutive points, in float32.
+    
+    GPS coordinates carry ~7 significant digits, so float32 is enough and
+    halves memory traffic. Time deltas are taken in int64 nanoseconds and
+    only converted to float32 after the subtraction.
+    
+    Returns:
+        (distance_km, hours, speed_kmh) per segment; speed is 0 where the
+        time delta is not positive
+    """
+    lat = lat.astype(np.float32, copy=False)
+    lng = lng.astype(np.float32, copy=False)
+    distance_km = _haversine_km(lat[:-1], lng[:-1], lat[1:], lng[1:])
+    hours = (np.diff(t) / np.timedelta64(1, 's')).astype(np.float32) / 3600.0
+    
+    speed_kmh = np.zeros(len(distance_km), dtype=np.float32)
+    np.divide(distance_km, hours, out=speed_kmh, where=hours > 0)
+    return distance_km, hours, speed_kmh
+
+
+def _datetime_array(series: pd.Series) -> Tuple[np.ndarray, Optional[object]]:
+    """Split a datetime Series into a naive UTC datetime64[ns] array and its timezone."""
+    tz = series.dt.tz
+    if tz is not None:
+        series = series.dt.tz_convert(None)
+    return series.to_numpy(dtype='datetime64[ns]'), tz
+
+
+def _build_frame(t: np.ndarray, tz, ids: np.ndarray,
+                 lat: np.ndarray, lng: np.ndarray) -> pd.DataFrame:
+    """Assemble cleaned column arrays back into a GPS DataFrame."""
+    datetimes = pd.DatetimeIndex(t)
+    if tz is not None:
+        datetimes = datetimes.tz_localize('UTC').tz_convert(tz)
+    return pd.DataFrame({'datetime': datetimes, 'id': ids, 'lng': lng, 'lat': lat})
+
+
 class GPSProcessor:
     """
     Enhanced GPS processing service using specialized movement analysis libraries.
@@ -128,6 +184,9 @@ class GPSProcessor:
         """
         Apply comprehensive GPS data cleaning pipeline.
         
+        The pipeline works on column arrays (timestamps, coordinates, ids)
+        and only builds a DataFrame once, at the return boundary.
+        
         Args:
             df: Raw GPS data DataFrame
             taxi_id: Taxi identifier for logging
@@ -135,28 +194,37 @@ class GPSProcessor:
         Returns:
             Cleaned DataFrame
         """
-        cleaned_df = df.copy()
-        
         try:
-            # 1. Remove duplicates
-            cleaned_df = cleaned_df.drop_duplicates(subset=['datetime'], keep='first')
+            t, tz = _datetime_array(df['datetime'])
             
-            # 2. Sort by timestamp
-            cleaned_df = cleaned_df.sort_values('datetime').reset_index(drop=True)
+            # 1-2. Sort by timestamp (stable, so the first duplicate wins) and remove duplicates
+            order = np.argsort(t, kind='stable')
+            t, first = np.unique(t[order], return_index=True)
+            keep = order[first]
+            lat = df['lat'].to_numpy()[keep]
+            lng = df['lng'].to_numpy()[keep]
+            ids = df['id'].to_numpy()[keep]
             
             # 3. Remove outliers using different methods based on available libraries
-            if SKMOVE_AVAILABLE:
-                cleaned_df = self._remove_outliers_skmove(cleaned_df, taxi_id)
-            elif PYMOVE_AVAILABLE:
-                cleaned_df = self._remove_outliers_pymove(cleaned_df, taxi_id)
+            if SKMOVE_AVAILABLE or PYMOVE_AVAILABLE:
+                frame = _build_frame(t, tz, ids, lat, lng)
+                if SKMOVE_AVAILABLE:
+                    frame = self._remove_outliers_skmove(frame, taxi_id)
+                else:
+                    frame = self._remove_outliers_pymove(frame, taxi_id)
+                t, _ = _datetime_array(frame['datetime'])
+                lat = frame['lat'].to_numpy()
+                lng = frame['lng'].to_numpy()
+                ids = frame['id'].to_numpy()
             else:
                 # Fallback: basic speed-based filtering
-                cleaned_df = self._remove_outliers_basic(cleaned_df, taxi_id)
+                mask = self._remove_outliers_basic(t, lat, lng, taxi_id)
+                t, lat, lng, ids = t[mask], lat[mask], lng[mask], ids[mask]
             
             # 4. Interpolate missing points if needed
-            cleaned_df = self._interpolate_missing_points(cleaned_df, taxi_id)
+            t, lat, lng, ids = self._interpolate_missing_points(t, lat, lng, ids, taxi_id)
             
-            return cleaned_df
+            return _build_frame(t, tz, ids, lat, lng)
         
         except Exception as e:
             logging.error(f"Error in cleaning pipeline for taxi {taxi_id}: {e}")
@@ -208,87 +276,62 @@ class GPSProcessor:
             logging.error(f"Error removing outliers with pymove for taxi {taxi_id}: {e}")
             return df
     
-    def _remove_outliers_basic(self, df: pd.DataFrame, taxi_id: str) -> pd.DataFrame:
-        """Basic outlier removal using speed calculation."""
+    def _remove_outliers_basic(self, t: np.ndarray, lat: np.ndarray,
+                               lng: np.ndarray, taxi_id: str) -> np.ndarray:
+        """
+        Basic outlier removal using speed calculation.
+        
+        Returns:
+            Boolean mask of the points to keep
+        """
         try:
-            if len(df) < 2:
-                return df
-            
-            # Calculate speeds between consecutive points
-            speeds = []
-            for i in range(1, len(df)):
-                point1 = df.iloc[i-1]
-                point2 = df.iloc[i]
-                
-                # Calculate distance using Haversine formula
-                lat1, lon1 = np.radians(point1['lat']), np.radians(point1['lng'])
-                lat2, lon2 = np.radians(point2['lat']), np.radians(point2['lng'])
-                
-                dlon = lon2 - lon1
-                dlat = lat2 - lat1
-                a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-                c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-                distance_km = 6371 * c  # Earth radius in km
-                
-                # Calculate time difference in hours
-                time_diff = (point2['datetime'] - point1['datetime']).total_seconds() / 3600
-                
-                if time_diff > 0:
-                    speed_kmh = distance_km / time_diff
-                else:
-                    speed_kmh = 0
-                
-                speeds.append(speed_kmh)
-            
-            # Add speeds to DataFrame (first point gets speed 0)
-            speeds = [0] + speeds
+            if len(t) < 2:
+                return np.ones(len(t), dtype=bool)
             
-            # Filter points with reasonable speeds
-            mask = (np.array(speeds) <= self.max_speed) & (np.array(speeds) >= 0)
-            filtered_df = df[mask].copy()
+            # Speeds between consecutive points (first point gets speed 0)
+            speeds = np.zeros(len(t), dtype=np.float32)
+            speeds[1:] = _segment_speeds_kmh(t, lat, lng)[2]
             
-            return filtered_df
+            # Keep points with reasonable speeds
+            return (speeds <= self.max_speed) & (speeds >= 0)
         
         except Exception as e:
             logging.error(f"Error in basic outlier removal for taxi {taxi_id}: {e}")
-            return df
+            return np.ones(len(t), dtype=bool)
     
-    def _interpolate_missing_points(self, df: pd.DataFrame, taxi_id: str) -> pd.DataFrame:
-        """Interpolate missing GPS points to regular time intervals."""
+    def _interpolate_missing_points(self, t: np.ndarray, lat: np.ndarray,
+                                    lng: np.ndarray, ids: np.ndarray,
+                                    taxi_id: str) -> Tuple[np.ndarray, ...]:
+        """
+        Interpolate missing GPS points to regular time intervals.
+        
+        Points falling on the regular grid anchor a linear interpolation of
+        the coordinates; ids are carried forward from the last anchor.
+        
+        Returns:
+            (timestamps, latitudes, longitudes, ids) on the regular grid
+        """
         try:
-            if len(df) < 2:
-                return df
-            
-            # Set datetime as index
-            df = df.set_index('datetime')
+            if len(t) < 2:
+                return t, lat, lng, ids
             
-            # Create regular time index
-            start_time = df.index.min()
-            end_time = df.index.max()
-            regular_index = pd.date_range(
-                start=start_time,
-                end=end_time,
-                freq=f'{self.sampling_rate}S'
-            )
-            
-            # Reindex and interpolate
-            df_regular = df.reindex(regular_index)
-            
-            # Interpolate coordinates
-            df_regular['lat'] = df_regular['lat'].interpolate(method='linear')
-            df_regular['lng'] = df_regular['lng'].interpolate(method='linear')
+            # Regular time grid as nanosecond offsets from the first point
+            step = self.sampling_rate * 10**9
+            offsets = (t - t[0]).astype(np.int64)
+            grid = np.arange(0, offsets[-1] + 1, step, dtype=np.int64)
             
-            # Forward fill other columns
-            df_regular['id'] = df_regular['id'].ffill()
+            on_grid = offsets % step == 0
+            anchors = offsets[on_grid]
             
-            # Reset index
-            df_regular = df_regular.reset_index().rename(columns={'index': 'datetime'})
+            lat_regular = np.interp(grid, anchors, lat[on_grid])
+            lng_regular = np.interp(grid, anchors, lng[on_grid])
+            ids_regular = ids[on_grid][np.searchsorted(anchors, grid, side='right') - 1]
             
-            return df_regular
+            return t[0] + grid.astype('timedelta64[ns]'), lat_regular, lng_regular, ids_regular
         
         except Exception as e:
             logging.error(f"Error interpolating points for taxi {taxi_id}: {e}")
-            return df.reset_index().rename(columns={'index': 'datetime'})
+            return t, lat, lng, ids
     
     def _calculate_cleaning_stats(self, original_df: pd.DataFrame, cleaned_df: pd.DataFrame) -> Dict:
         """Calculate statistics about the cleaning process."""
@@ -415,36 +458,17 @@ class GPSProcessor:
             if len(df) < 2:
                 return features
             
-            # Calculate total distance
-            total_distance = 0
-            speeds = []
-            
-            for i in range(1, len(df)):
-                point1 = df.iloc[i-1]
-                point2 = df.iloc[i]
-                
-                # Calculate distance using Haversine formula
-                lat1, lon1 = np.radians(point1['lat']), np.radians(point1['lng'])
-                lat2, lon2 = np.radians(point2['lat']), np.radians(point2['lng'])
-                
-                dlon = lon2 - lon1
-                dlat = lat2 - lat1
-                a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-                c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-                distance_km = 6371 * c
-                
-                total_distance += distance_km
-                
-                # Calculate speed
-                time_diff = (point2['datetime'] - point1['datetime']).total_seconds() / 3600
-                if time_diff > 0:
-                    speed_kmh = distance_km / time_diff
-                    speeds.append(speed_kmh)
+            t, _ = _datetime_array(df['datetime'])
+            distance_km, hours, speed_kmh = _segment_speeds_kmh(
+                t, df['lat'].to_numpy(), df['lng'].to_numpy()
+            )
+            total_distance = float(distance_km.sum(dtype=np.float64))
+            speeds = speed_kmh[hours > 0]
             
             features['total_distance_km'] = total_distance
-            features['avg_speed_kmh'] = np.mean(speeds) if speeds else 0
-            features['max_speed_kmh'] = np.max(speeds) if speeds else 0
-            features['std_speed_kmh'] = np.std(speeds) if speeds else 0
+            features['avg_speed_kmh'] = float(speeds.mean()) if len(speeds) else 0
+            features['max_speed_kmh'] = float(speeds.max()) if len(speeds) else 0
+            features['std_speed_kmh'] = float(speeds.std()) if len(speeds) else 0
             
             return features
         
@@ -11,37 +11,162 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from functools import lru_cache
+import hashlib
+import importlib.util
 import logging
+import os
+import tempfile
 
 # Spatial analysis libraries
-try:
-    import osmnx as ox
-    import networkx as nx
-    OSMNX_AVAILABLE = True
-except ImportError:
-    OSMNX_AVAILABLE = False
+# osmnx/networkx are slow to import; only check availability here and
+# import them where street networks are actually used
+OSMNX_AVAILABLE = (
+    importlib.util.find_spec('osmnx') is not None
+    and importlib.util.find_spec('networkx') is not None
+)
+if not OSMNX_AVAILABLE:
     logging.warning("osmnx not available")
 
 try:
     import h3
+    # Integer API: cells as uint64 instead of 15-char hex strings (h3-py 3.x / 4.x names)
+    from h3.api import numpy_int as h3_int
+    h3_cell = getattr(h3_int, 'geo_to_h3', None) or h3_int.latlng_to_cell
     H3_AVAILABLE = True
 except ImportError:
     H3_AVAILABLE = False
     logging.warning("h3 not available")
 
+try:
+    # Cython loop over whole arrays (h3-py 3.7+, removed in 4.x)
+    from h3.unstable import vect as h3_vect
+    H3_VECT_AVAILABLE = True
+except ImportError:
+    H3_VECT_AVAILABLE = False
+
+try:
+    # Rust/Arrow-vectorized H3 indexing, independent of the h3-py version
+    try:
+        from h3ronpy.vector import coordinates_to_cells
+    except ImportError:
+        from h3ronpy.arrow.vector import coordinates_to_cells
+    USE_H3RONPY = True
+except ImportError:
+    USE_H3RONPY = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logging.warning("numba not available")
+
 try:
     import geopandas as gpd
-    from shapely.geometry import Point, LineString, Polygon
     GEOPANDAS_AVAILABLE = True
 except ImportError:
     GEOPANDAS_AVAILABLE = False
     logging.warning("geopandas not available")
 
-from django.db import models
-from django.contrib.gis.geos import Point, LineString
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
 from apps.mobility.models import TDriveRawPoint, TDriveTrajectory
 
 
+def _haversine_km(lat1: np.ndarray, lon1: np.ndarray,
+                  lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Vectorized Haversine distance in kilometers."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat * 0.5)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon * 0.5)**2
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))  # Earth radius in km
+
+
+# Trip count above which the fused Numba kernel beats the NumPy expression
+NUMBA_HAVERSINE_THRESHOLD = 50_000
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _haversine_km_numba(lat1, lon1, lat2, lon2, out):
+        """Fused, parallel Haversine (km) writing into a preallocated array."""
+        to_rad = np.pi / 180.0
+        for i in prange(lat1.shape[0]):
+            phi1 = lat1[i] * to_rad
+            phi2 = lat2[i] * to_rad
+            dlat = phi2 - phi1
+            dlon = (lon2[i] - lon1[i]) * to_rad
+            a = np.sin(dlat * 0.5)**2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlon * 0.5)**2
+            out[i] = 6371.0 * 2 * np.arcsin(np.sqrt(a))
+        return out
+
+
+def _h3_cells(lats: np.ndarray, lngs: np.ndarray, resolution: int) -> np.ndarray:
+    """
+    H3 cell indices for arrays of coordinates, as uint64.
+    
+    Prefers h3ronpy, then the h3-py vectorized binding, so the whole column
+    is indexed in a single call; otherwise falls back to the scalar API.
+    """
+    lats = np.ascontiguousarray(lats, dtype=np.float64)
+    lngs = np.ascontiguousarray(lngs, dtype=np.float64)
+    
+    if USE_H3RONPY:
+        cells = coordinates_to_cells(lats, lngs, resolution)
+        return np.asarray(cells.to_numpy(zero_copy_only=False), dtype=np.uint64)
+    
+    if H3_VECT_AVAILABLE:
+        return h3_vect.geo_to_h3(lats, lngs, resolution)
+    
+    return np.fromiter(
+        (h3_cell(lat, lng, resolution) for lat, lng in zip(lats.tolist(), lngs.tolist())),
+        dtype=np.uint64,
+        count=len(lats)
+    )
+
+
+def _h3_to_string(cells: np.ndarray) -> List[str]:
+    """Hex string form of uint64 H3 cell indices."""
+    return [format(cell, 'x') for cell in cells.tolist()]
+
+
+def _h3_columns_to_string(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert integer H3 cell columns to hex strings for serialization."""
+    for column in ('origin_h3', 'destination_h3'):
+        if column in df.columns and df[column].dtype.kind in 'iu':
+            df[column] = _h3_to_string(df[column].to_numpy(dtype=np.uint64))
+    return df
+
+
+def _top_k_indices(counts: np.ndarray, k: int = 10) -> np.ndarray:
+    """Indices of the k largest counts, largest first, via a partial sort."""
+    if len(counts) > k:
+        idx = np.argpartition(-counts, k)[:k]
+    else:
+        idx = np.arange(len(counts))
+    return idx[np.argsort(-counts[idx], kind='stable')]
+
+
+def _top_counts(values: np.ndarray, k: int = 10) -> Dict:
+    """The k most frequent values with their counts, most frequent first (H3 cells as hex)."""
+    uniques, counts = np.unique(values, return_counts=True)
+    idx = _top_k_indices(counts, k)
+    keys = uniques[idx]
+    if keys.dtype.kind in 'iu':
+        keys = np.array(_h3_to_string(keys.astype(np.uint64)), dtype=object)
+    return dict(zip(keys.tolist(), counts[idx].tolist()))
+
+
+def _network_cache_path(key: Tuple[float, float, float, str]) -> str:
+    """On-disk GraphML location for a street network cache key."""
+    cache_dir = getattr(settings, 'CACHE_DIR', os.path.join(tempfile.gettempdir(), 'mobility_cache'))
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, 'osmnx', f"{digest}.graphml")
+
+
 class ODAnalyzer:
     """
     Enhanced Origin-Destination analysis service using spatial network analysis.
@@ -89,27 +214,43 @@ class ODAnalyzer:
         Returns:
             Dictionary with OD analysis results
         """
-        # Query trajectories
-        trajectories = TDriveTrajectory.objects.filter(
+        # Query trajectories once; only the OD key fields are needed
+        trajectories = list(TDriveTrajectory.objects.filter(
             taxi_id__in=taxi_ids,
             trajectory_date__range=(start_date, end_date)
-        ).select_related()
+        ).only('id', 'taxi_id', 'trajectory_date'))
         
         if not trajectories:
             return {"error": "No trajectories found for the specified criteria"}
         
-        od_data = []
-        
-        for traj in trajectories:
-            # Extract OD information from trajectory
-            od_info = self._extract_od_from_trajectory(traj)
-            if od_info:
-                od_data.append(od_info)
-        
-        if not od_data:
+        # OD data is collected column-wise (one list per field)
+        od_data = self._new_od_columns()
+        try:
+            # Savepoint: a failed batch query must not abort the caller's
+            # transaction before the per-trajectory fallback runs
+            with transaction.atomic():
+                self._extract_od_batch(trajectories, od_data)
+        except Exception as e:
+            logging.warning(f"Batched OD extraction failed, using per-trajectory queries: {e}")
+            od_data = self._new_od_columns()
+            for traj in trajectories:
+                # Extract OD information from trajectory
+                self._extract_od_from_trajectory(traj, od_data)
+        
+        od_pair_count = len(od_data['taxi_id'])
+        if not od_pair_count:
             return {"error": "No valid OD pairs extracted"}
         
-        # Create OD matrix
+        # Add H3 indices if available, one batched call per endpoint column
+        if H3_AVAILABLE:
+            od_data['origin_h3'] = _h3_cells(
+                od_data['origin_lat'], od_data['origin_lng'], self.h3_resolution
+            )
+            od_data['destination_h3'] = _h3_cells(
+                od_data['destination_lat'], od_data['destination_lng'], self.h3_resolution
+            )
+        
+        # Create OD matrix from the endpoints already in memory
         od_matrix = self._create_od_matrix(od_data)
         
         # Analyze spatial patterns
@@ -118,84 +259,161 @@ class ODAnalyzer:
         return {
             'taxi_count': len(taxi_ids),
             'trajectory_count': len(trajectories),
-            'od_pair_count': len(od_data),
+            'od_pair_count': od_pair_count,
             'od_matrix': od_matrix,
             'spatial_analysis': spatial_analysis,
-            'od_data': od_data
+            'od_data': self._od_records(od_data)
+        }
+    
+    def _od_records(self, od_data: Dict[str, List]) -> List[Dict]:
+        """Per-pair OD dictionaries, with H3 cells in hex string form."""
+        columns = dict(od_data)
+        for column in ('origin_h3', 'destination_h3'):
+            if column in columns:
+                columns[column] = _h3_to_string(np.asarray(columns[column], dtype=np.uint64))
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    
+    def _new_od_columns(self) -> Dict[str, List]:
+        """Empty column-oriented OD data container."""
+        columns = [
+            'taxi_id', 'date', 'origin_lat', 'origin_lng',
+            'destination_lat', 'destination_lng', 'departure_time',
+            'arrival_time', 'trip_duration_minutes', 'point_count'
+        ]
+        return {column: [] for column in columns}
+    
+    def _extract_od_batch(self, trajectories, od_data: Dict[str, List]) -> None:
+        """
+        Extract Origin-Destination information for many trajectories at once.
+        
+        Point counts, origins and destinations for every (taxi_id, date) key
+        are fetched with three queries in total (GROUP BY and two
+        DISTINCT ON), instead of several queries per trajectory.
+        
+        Args:
+            trajectories: Iterable of TDriveTrajectory objects
+            od_data: Column-oriented OD data, appended to in trajectory order
+        """
+        keys = {(traj.taxi_id, traj.trajectory_date) for traj in trajectories}
+        if not keys:
+            return
+        
+        dates = [date for _, date in keys]
+        points = TDriveRawPoint.objects.filter(
+            taxi_id__in={taxi_id for taxi_id, _ in keys},
+            timestamp__date__range=(min(dates), max(dates)),
+            is_valid=True
+        ).annotate(date=TruncDate('timestamp'))
+        
+        counts = {
+            (row['taxi_id'], row['date']): row['count']
+            for row in points.order_by().values('taxi_id', 'date').annotate(count=Count('id'))
+        }
+        
+        fields = ('taxi_id', 'date', 'latitude', 'longitude', 'timestamp')
+        origins = {
+            (row['taxi_id'], row['date']): row
+            for row in points.order_by('taxi_id', 'date', 'timestamp')
+                             .distinct('taxi_id', 'date').values(*fields)
         }
+        destinations = {
+            (row['taxi_id'], row['date']): row
+            for row in points.order_by('taxi_id', 'date', '-timestamp')
+                             .distinct('taxi_id', 'date').values(*fields)
+        }
+        
+        for traj in trajectories:
+            key = (traj.taxi_id, traj.trajectory_date)
+            if counts.get(key, 0) < 2:
+                continue
+            
+            origin = origins[key]
+            destination = destinations[key]
+            self._append_od(
+                od_data, traj.taxi_id, traj.trajectory_date,
+                origin['latitude'], origin['longitude'], origin['timestamp'],
+                destination['latitude'], destination['longitude'], destination['timestamp'],
+                counts[key]
+            )
+    
+    def _append_od(self, od_data: Dict[str, List], taxi_id: str, date,
+                   origin_lat: float, origin_lng: float, departure_time: datetime,
+                   destination_lat: float, destination_lng: float, arrival_time: datetime,
+                   point_count: int) -> None:
+        """Append the OD information for one trajectory to the OD columns."""
+        od_data['taxi_id'].append(taxi_id)
+        od_data['date'].append(date)
+        od_data['origin_lat'].append(origin_lat)
+        od_data['origin_lng'].append(origin_lng)
+        od_data['destination_lat'].append(destination_lat)
+        od_data['destination_lng'].append(destination_lng)
+        od_data['departure_time'].append(departure_time)
+        od_data['arrival_time'].append(arrival_time)
+        od_data['trip_duration_minutes'].append((arrival_time - departure_time).total_seconds() / 60)
+        od_data['point_count'].append(point_count)
     
-    def _extract_od_from_trajectory(self, trajectory: TDriveTrajectory) -> Optional[Dict]:
+    def _extract_od_from_trajectory(self, trajectory: TDriveTrajectory,
+                                    od_data: Dict[str, List]) -> bool:
         """
         Extract Origin-Destination information from a trajectory.
         
         Args:
             trajectory: TDriveTrajectory object
+            od_data: Column-oriented OD data to append to
         
         Returns:
-            OD information dictionary or None if invalid
+            True if an OD pair was appended, False if invalid
         """
         try:
-            # Get raw points for this trajectory
-            points = TDriveRawPoint.objects.filter(
+            # Get raw points for this trajectory in a single query
+            points = list(TDriveRawPoint.objects.filter(
                 taxi_id=trajectory.taxi_id,
                 timestamp__date=trajectory.trajectory_date,
                 is_valid=True
-            ).order_by('timestamp')
+            ).order_by('timestamp').only('latitude', 'longitude', 'timestamp'))
             
             if len(points) < 2:
-                return None
+                return False
             
             # Extract origin and destination
-            origin = points.first()
-            destination = points.last()
-            
-            od_info = {
-                'taxi_id': trajectory.taxi_id,
-                'date': trajectory.trajectory_date,
-                'origin_lat': origin.latitude,
-                'origin_lng': origin.longitude,
-                'destination_lat': destination.latitude,
-                'destination_lng': destination.longitude,
-                'departure_time': origin.timestamp,
-                'arrival_time': destination.timestamp,
-                'trip_duration_minutes': (destination.timestamp - origin.timestamp).total_seconds() / 60,
-                'point_count': len(points)
-            }
-            
-            # Add H3 indices if available
-            if H3_AVAILABLE:
-                od_info['origin_h3'] = h3.geo_to_h3(
-                    origin.latitude, origin.longitude, self.h3_resolution
-                )
-                od_info['destination_h3'] = h3.geo_to_h3(
-                    destination.latitude, destination.longitude, self.h3_resolution
-                )
+            origin = points[0]
+            destination = points[-1]
             
-            return od_info
+            self._append_od(
+                od_data, trajectory.taxi_id, trajectory.trajectory_date,
+                origin.latitude, origin.longitude, origin.timestamp,
+                destination.latitude, destination.longitude, destination.timestamp,
+                len(points)
+            )
+            return True
         
         except Exception as e:
             logging.error(f"Error extracting OD from trajectory {trajectory.id}: {e}")
-            return None
+            return False
     
-    def _create_od_matrix(self, od_data: List[Dict]) -> Dict:
+    def _create_od_matrix(self, od_data: Dict[str, List]) -> Dict:
         """
         Create Origin-Destination matrix from OD data.
         
         Args:
-            od_data: List of OD information dictionaries
+            od_data: Column-oriented OD data (field -> list of values)
         
         Returns:
             OD matrix with counts and statistics
         """
-        if not od_data:
-            return {}
-        
         # Create DataFrame
-        df = pd.DataFrame(od_data)
+        df = pd.DataFrame(od_data, copy=False)
+        if df.empty:
+            return {}
         
         # Group by origin and destination H3 cells
         if H3_AVAILABLE and 'origin_h3' in df.columns and 'destination_h3' in df.columns:
-            od_matrix = df.groupby(['origin_h3', 'destination_h3']).agg({
+            # Hex-string cells (external input) are grouped as categoricals;
+            # uint64 cells already hash as integers
+            for column in ('origin_h3', 'destination_h3'):
+                if df[column].dtype == object:
+                    df[column] = df[column].astype('category')
+            od_matrix = df.groupby(['origin_h3', 'destination_h3'], observed=True, sort=False).agg({
                 'taxi_id': 'count',
                 'trip_duration_minutes': ['mean', 'std'],
                 'point_count': 'mean'
@@ -205,42 +423,45 @@ class ODAnalyzer:
             od_matrix.columns = ['origin_h3', 'destination_h3', 'trip_count', 
                                'avg_duration', 'std_duration', 'avg_points']
             
-            return od_matrix.to_dict('records')
+            return _h3_columns_to_string(od_matrix).to_dict('records')
         
         else:
             # Fallback: simple count by origin/destination coordinates (rounded)
-            df['origin_rounded'] = df.apply(
-                lambda x: f"{x['origin_lat']:.3f},{x['origin_lng']:.3f}", axis=1
-            )
-            df['destination_rounded'] = df.apply(
-                lambda x: f"{x['destination_lat']:.3f},{x['destination_lng']:.3f}", axis=1
-            )
+            keys = ['olat_r', 'olng_r', 'dlat_r', 'dlng_r']
+            for key, column in zip(keys, ['origin_lat', 'origin_lng', 'destination_lat', 'destination_lng']):
+                df[key] = np.round(df[column].to_numpy(dtype=float), 3)
             
-            od_matrix = df.groupby(['origin_rounded', 'destination_rounded']).agg({
+            od_matrix = df.groupby(keys, sort=False).agg({
                 'taxi_id': 'count',
                 'trip_duration_minutes': ['mean', 'std']
             }).reset_index()
             
-            od_matrix.columns = ['origin', 'destination', 'trip_count', 
-                               'avg_duration', 'std_duration']
+            od_matrix.columns = keys + ['trip_count', 'avg_duration', 'std_duration']
+            
+            # Labels are only built for the aggregated rows
+            od_matrix.insert(0, 'origin', [
+                f"{lat:.3f},{lng:.3f}" for lat, lng in zip(od_matrix['olat_r'], od_matrix['olng_r'])
+            ])
+            od_matrix.insert(1, 'destination', [
+                f"{lat:.3f},{lng:.3f}" for lat, lng in zip(od_matrix['dlat_r'], od_matrix['dlng_r'])
+            ])
             
-            return od_matrix.to_dict('records')
+            return od_matrix.drop(columns=keys).to_dict('records')
     
-    def _analyze_spatial_patterns(self, od_data: List[Dict]) -> Dict:
+    def _analyze_spatial_patterns(self, od_data: Dict[str, List]) -> Dict:
         """
         Analyze spatial patterns in OD data.
         
         Args:
-            od_data: List of OD information dictionaries
+            od_data: Column-oriented OD data (field -> list of values)
         
         Returns:
             Spatial analysis results
         """
-        if not od_data:
+        df = pd.DataFrame(od_data, copy=False)
+        if df.empty:
             return {}
         
-        df = pd.DataFrame(od_data)
-        
         analysis = {
             'total_trips': len(df),
             'unique_origins': df[['origin_lat', 'origin_lng']].drop_duplicates().shape[0],
@@ -258,26 +479,30 @@ class ODAnalyzer:
     
     def _calculate_trip_distances(self, df: pd.DataFrame) -> Dict:
         """Calculate trip distance statistics using Haversine formula."""
-        distances = []
-        
-        for _, row in df.iterrows():
-            # Haversine distance calculation
-            lat1, lon1 = np.radians(row['origin_lat']), np.radians(row['origin_lng'])
-            lat2, lon2 = np.radians(row['destination_lat']), np.radians(row['destination_lng'])
-            
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-            c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-            distance_km = 6371 * c
-            
-            distances.append(distance_km)
+        # float32 is ample for km-level trip distances and halves memory traffic
+        coords = tuple(
+            df[column].to_numpy(dtype=np.float32)
+            for column in ('origin_lat', 'origin_lng', 'destination_lat', 'destination_lng')
+        )
+        
+        if NUMBA_AVAILABLE and len(df) > NUMBA_HAVERSINE_THRESHOLD:
+            distances = _haversine_km_numba(*coords, np.empty(len(df), dtype=np.float32))
+        else:
+            distances = _haversine_km(*coords)
+        
+        if not len(distances):
+            return {
+                'avg_distance_km': 0,
+                'median_distance_km': 0,
+                'max_distance_km': 0,
+                'min_distance_km': 0
+            }
         
         return {
-            'avg_distance_km': np.mean(distances) if distances else 0,
-            'median_distance_km': np.median(distances) if distances else 0,
-            'max_distance_km': np.max(distances) if distances else 0,
-            'min_distance_km': np.min(distances) if distances else 0
+            'avg_distance_km': float(np.mean(distances, dtype=np.float64)),
+            'median_distance_km': float(np.median(distances)),
+            'max_distance_km': float(np.max(distances)),
+            'min_distance_km': float(np.min(distances))
         }
     
     def _analyze_h3_patterns(self, df: pd.DataFrame) -> Dict:
@@ -286,12 +511,16 @@ class ODAnalyzer:
         
         try:
             # Most frequent origins and destinations
-            top_origins = df['origin_h3'].value_counts().head(10).to_dict()
-            top_destinations = df['destination_h3'].value_counts().head(10).to_dict()
+            top_origins = _top_counts(df['origin_h3'].to_numpy())
+            top_destinations = _top_counts(df['destination_h3'].to_numpy())
             
             # OD flow analysis
-            od_flows = df.groupby(['origin_h3', 'destination_h3']).size().reset_index(name='count')
-            top_flows = od_flows.nlargest(10, 'count').to_dict('records')
+            od_flows = df.groupby(
+                ['origin_h3', 'destination_h3'], observed=True, sort=False
+            ).size().reset_index(name='count')
+            top_flows = _h3_columns_to_string(
+                od_flows.iloc[_top_k_indices(od_flows['count'].to_numpy())].copy()
+            ).to_dict('records')
             
             h3_analysis.update({
                 'top_origins': top_origins,
@@ -322,16 +551,14 @@ class ODAnalyzer:
             return False
         
         try:
-            self.street_network = ox.graph_from_point(
-                center_point,
-                dist=network_distance,
-                network_type=self.network_type,
-                simplify=True
+            # Networks are reused per ~100 m center cell, distance and network type
+            key = (
+                round(center_point[0], 3),
+                round(center_point[1], 3),
+                float(network_distance),
+                self.network_type
             )
-            
-            # Add edge speeds and travel times
-            self.street_network = ox.add_edge_speeds(self.street_network)
-            self.street_network = ox.add_edge_travel_times(self.street_network)
+            self.street_network = self._build_network(key)
             
             logging.info(f"Street network loaded with {len(self.street_network)} nodes")
             return True
@@ -341,6 +568,42 @@ class ODAnalyzer:
             self.street_network = None
             return False
     
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _build_network(key: Tuple[float, float, float, str]):
+        """
+        Load or build a street network with edge speeds and travel times.
+        
+        Results are memoised in-process and persisted as GraphML, so a
+        network is downloaded from OSM at most once per cache key.
+        """
+        import osmnx as ox
+        
+        lat, lng, network_distance, network_type = key
+        path = _network_cache_path(key)
+        
+        if os.path.exists(path):
+            return ox.load_graphml(path)
+        
+        graph = ox.graph_from_point(
+            (lat, lng),
+            dist=network_distance,
+            network_type=network_type,
+            simplify=True
+        )
+        
+        # Add edge speeds and travel times
+        graph = ox.add_edge_speeds(graph)
+        graph = ox.add_edge_travel_times(graph)
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            ox.save_graphml(graph, path)
+        except OSError as e:
+            logging.warning(f"Could not cache street network to {path}: {e}")
+        
+        return graph
+    
     def calculate_optimal_routes(self, origins: List[Tuple[float, float]], 
                                destinations: List[Tuple[float, float]]) -> List[Dict]:
         """
@@ -356,66 +619,90 @@ class ODAnalyzer:
         if not OSMNX_AVAILABLE or self.street_network is None:
             return [{"error": "Street network not available"}]
         
+        import osmnx as ox
+        
         routes = []
+        pairs = list(zip(origins, destinations))
+        if not pairs:
+            return routes
         
         try:
-            for i, (origin, destination) in enumerate(zip(origins, destinations)):
-                # Find nearest network nodes
-                orig_node = ox.distance.nearest_nodes(self.street_network, origin[1], origin[0])
-                dest_node = ox.distance.nearest_nodes(self.street_network, destination[1], destination[0])
-                
-                # Calculate shortest path
-                try:
-                    route = nx.shortest_path(
-                        self.street_network, 
-                        orig_node, 
-                        dest_node, 
-                        weight='travel_time'
-                    )
-                    
-                    # Calculate route metrics
-                    route_length = nx.shortest_path_length(
-                        self.street_network, 
-                        orig_node, 
-                        dest_node, 
-                        weight='length'
-                    )
-                    
-                    route_time = nx.shortest_path_length(
-                        self.street_network, 
-                        orig_node, 
-                        dest_node, 
-                        weight='travel_time'
-                    )
-                    
-                    routes.append({
-                        'origin': origin,
-                        'destination': destination,
-                        'route_nodes': route,
-                        'distance_meters': route_length,
-                        'travel_time_seconds': route_time,
-                        'success': True
-                    })
-                
-                except nx.NetworkXNoPath:
-                    routes.append({
-                        'origin': origin,
-                        'destination': destination,
-                        'error': "No path found",
-                        'success': False
-                    })
+            # Find nearest network nodes with one spatial-index query per side
+            orig_nodes = ox.distance.nearest_nodes(
+                self.street_network,
+                X=[origin[1] for origin, _ in pairs],
+                Y=[origin[0] for origin, _ in pairs]
+            )
+            dest_nodes = ox.distance.nearest_nodes(
+                self.street_network,
+                X=[destination[1] for _, destination in pairs],
+                Y=[destination[0] for _, destination in pairs]
+            )
+            
+            # Dijkstra is pure Python (GIL-bound): pairs are routed sequentially
+            routes = [
+                self._route_one(origin, destination, orig_node, dest_node)
+                for (origin, destination), orig_node, dest_node in zip(pairs, orig_nodes, dest_nodes)
+            ]
         
         except Exception as e:
             logging.error(f"Error calculating routes: {e}")
         
         return routes
     
-    def aggregate_od_by_h3(self, od_data: List[Dict]) -> Dict:
+    def _route_one(self, origin: Tuple[float, float], destination: Tuple[float, float],
+                   orig_node, dest_node) -> Dict:
+        """Fastest route between two network nodes, as a route information dictionary."""
+        import networkx as nx
+        
+        # One Dijkstra gives both the fastest route and its travel time
+        try:
+            route_time, route = nx.single_source_dijkstra(
+                self.street_network,
+                orig_node,
+                target=dest_node,
+                weight='travel_time'
+            )
+        except nx.NetworkXNoPath:
+            return {
+                'origin': origin,
+                'destination': destination,
+                'error': "No path found",
+                'success': False
+            }
+        except Exception as e:
+            # A failed pair (e.g. NodeNotFound) must not lose the whole batch
+            logging.error(f"Error calculating route from {origin} to {destination}: {e}")
+            return {
+                'origin': origin,
+                'destination': destination,
+                'error': str(e),
+                'success': False
+            }
+        
+        # Route length along the chosen (fastest) parallel edges
+        graph = self.street_network
+        route_length = sum(
+            min(graph[u][v].values(), key=lambda edge: edge.get('travel_time', float('inf')))['length']
+            for u, v in zip(route, route[1:])
+        )
+        
+        return {
+            'origin': origin,
+            'destination': destination,
+            'route_nodes': route,
+            'distance_meters': route_length,
+            'travel_time_seconds': route_time,
+            'success': True
+        }
+    
+    def aggregate_od_by_h3(self, od_data) -> Dict:
         """
         Aggregate OD data using H3 spatial indexing.
         
         Args:
-            od_data: List of OD information dictionaries
+            od_data: OD data, either column-oriented (field -> list of values)
+                or a list of OD information dictionaries
         
         Returns:
             Aggregated OD data by H3 cells
@@ -423,37 +710,47 @@ class ODAnalyzer:
         if not H3_AVAILABLE:
             return {"error": "H3 not available"}
         
-        df = pd.DataFrame(od_data)
+        df = pd.DataFrame(od_data, copy=False) if isinstance(od_data, dict) else pd.DataFrame(od_data)
         
-        # Add H3 indices if not present
+        # Add H3 indices if not present (uint64, one batched call per column)
         if 'origin_h3' not in df.columns:
-            df['origin_h3'] = df.apply(
-                lambda x: h3.geo_to_h3(x['origin_lat'], x['origin_lng'], self.h3_resolution), 
-                axis=1
+            df['origin_h3'] = _h3_cells(
+                df['origin_lat'].to_numpy(), df['origin_lng'].to_numpy(), self.h3_resolution
             )
         
         if 'destination_h3' not in df.columns:
-            df['destination_h3'] = df.apply(
-                lambda x: h3.geo_to_h3(x['destination_lat'], x['destination_lng'], self.h3_resolution), 
-                axis=1
+            df['destination_h3'] = _h3_cells(
+                df['destination_lat'].to_numpy(), df['destination_lng'].to_numpy(), self.h3_resolution
             )
         
         # Aggregate by H3 cells
-        origin_aggregation = df.groupby('origin_h3').agg({
+        # Hex string cells are grouped as categoricals; uint64 cells as-is
+        for column in ('origin_h3', 'destination_h3'):
+            if df[column].dtype == object:
+                df[column] = df[column].astype('category')
+        
+        origin_aggregation = df.groupby('origin_h3', observed=True, sort=False).agg({
             'taxi_id': 'count',
             'trip_duration_minutes': 'mean'
         }).rename(columns={'taxi_id': 'departure_count', 'trip_duration_minutes': 'avg_departure_duration'})
         
-        destination_aggregation = df.groupby('destination_h3').agg({
+        destination_aggregation = df.groupby('destination_h3', observed=True, sort=False).agg({
             'taxi_id': 'count',
             'trip_duration_minutes': 'mean'
         }).rename(columns={'taxi_id': 'arrival_count', 'trip_duration_minutes': 'avg_arrival_duration'})
         
-        # Combine aggregations
-        h3_aggregation = pd.concat([origin_aggregation, destination_aggregation], axis=1)
-        h3_aggregation = h3_aggregation.fillna(0)
+        # Combine aggregations (outer join on the cell index; counts stay integer)
+        h3_aggregation = origin_aggregation.join(destination_aggregation, how='outer').fillna(0)
+        for column in ('departure_count', 'arrival_count'):
+            h3_aggregation[column] = h3_aggregation[column].astype(np.int64)
         
         # Calculate net flow
-        h3_aggregation['net_flow'] = h3_aggregation['arrival_count'] - h3_aggregation['departure_count']
+        h3_aggregation['net_flow'] = (
+            h3_aggregation['arrival_count'].to_numpy() - h3_aggregation['departure_count'].to_numpy()
+        )
+        
+        # Integer cells are reported in the usual hex form
+        if h3_aggregation.index.dtype.kind in 'iu':
+            h3_aggregation.index = _h3_to_string(h3_aggregation.index.to_numpy(dtype=np.uint64))
         
         return h3_aggregation.reset_index().to_dict('records')
@@ -10,19 +10,42 @@ Exemple: 1,2008-02-02 13:30:39,116.51172,39.92123
 ============================================================================
 """
 
+import io
 import os
-import csv
+import importlib.util
+import logging
+import math
+import mmap
 import uuid
+import multiprocessing
+import textwrap
+from array import array
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
-from decimal import Decimal, InvalidOperation
 
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
 
-from django.db import transaction, connection
+# pyarrow est lourd à importer: seule sa disponibilité est vérifiée ici,
+# l'import a lieu à la première lecture de fichier
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+if not PYARROW_AVAILABLE:
+    logging.warning("pyarrow not available")
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logging.warning("numba not available")
+
+from django.conf import settings
+from django.db import transaction, connection, connections
+from django.db.models.base import ModelState
 from django.utils import timezone
 from django.contrib.gis.geos import Point
 
@@ -31,6 +54,414 @@ from apps.mobility.models import (
     TDriveImportLog,
     TDriveValidationError
 )
+from apps.mobility.services.trajectory_analyzer import invalidate_trajectory_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Échappement des champs texte pour COPY ... WITH (FORMAT text)
+_COPY_TEXT_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+})
+
+
+@lru_cache(maxsize=4096)
+def _parse_tdrive_timestamp(value: str) -> datetime:
+    """
+    Parse un timestamp T-Drive 'YYYY-MM-DD HH:MM:SS'.
+    
+    Découpage à positions fixes (bien plus rapide que strptime); strptime
+    reste utilisé pour les formes non canoniques (ex: mois sur un chiffre).
+    Mémoïsé: les timestamps se répètent au sein d'une trajectoire (le cache
+    est vidé à chaque fichier).
+    
+    Raises:
+        ValueError: si le timestamp est invalide
+    """
+    if (len(value) == 19 and value[4] == '-' and value[7] == '-'
+            and value[10] == ' ' and value[13] == ':' and value[16] == ':'):
+        return datetime(
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19])
+        )
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+
+@lru_cache(maxsize=4096)
+def _copy_timestamp(value) -> str:
+    """
+    Formate un timestamp pour COPY avec un décalage UTC explicite.
+    
+    PostgreSQL lit un timestamp naïf dans le fuseau de la session (UTC avec
+    USE_TZ) alors que l'ORM l'interprète dans TIME_ZONE: le décalage
+    explicite fait stocker le même instant aux deux chemins.
+    
+    Args:
+        value: Timestamp canonique (str) ou datetime
+    """
+    if type(value) is str:
+        value = _parse_tdrive_timestamp(value)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+    return value.isoformat()
+
+
+# Nombre maximal de jours par mois (février bissextile traité à part)
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _is_canonical_timestamp(value: str) -> bool:
+    """
+    Vérifie sans créer de datetime qu'un timestamp est un
+    'YYYY-MM-DD HH:MM:SS' valide, transmissible tel quel à PostgreSQL.
+    """
+    if not (len(value) == 19 and value[4] == '-' and value[7] == '-'
+            and value[10] == ' ' and value[13] == ':' and value[16] == ':'):
+        return False
+    
+    digits = value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19]
+    if not (digits.isascii() and digits.isdigit()) or digits[0:4] == '0000':
+        return False
+    
+    month = int(digits[4:6])
+    day = int(digits[6:8])
+    if not (1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month]):
+        return False
+    if digits[8:10] > '23' or digits[10:12] > '59' or digits[12:14] > '59':
+        return False
+    if month == 2 and day == 29:
+        year = int(digits[0:4])
+        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    return True
+
+
+def _compile_line_parser(
+    strict: bool,
+    bounds: Tuple[float, float, float, float],
+    bbox: Optional[Tuple[float, float, float, float]] = None
+):
+    """
+    Génère un parseur de ligne T-Drive spécialisé pour une configuration.
+    
+    Le schéma du fichier ne varie jamais: les bornes sont inlinées comme
+    constantes et les branches strict/bbox sont résolues à la génération,
+    ce qui supprime tout lookup d'attribut ou de dict par ligne.
+    
+    Args:
+        strict: Mode strict (points hors bornes rejetés)
+        bounds: (lon_min, lon_max, lat_min, lat_max) globaux
+        bbox: (lon_min, lon_max, lat_min, lat_max) de Beijing, ou None
+    
+    Returns:
+        Fonction parse(row) -> (point, error_type, error_msg) où point vaut
+        (timestamp, longitude, latitude, is_valid, validation_notes) ou None
+        si la ligne est rejetée; error_type est renseigné si l'erreur doit
+        être journalisée. Un timestamp canonique est renvoyé tel quel (str),
+        sinon sous forme de datetime.
+    """
+    lon_min, lon_max, lat_min, lat_max = bounds
+    checks = [
+        f"    if not ({lon_min!r} <= longitude <= {lon_max!r}):\n"
+        f"        errors.append(f\"Longitude {{longitude}} out of range\")\n",
+        f"    if not ({lat_min!r} <= latitude <= {lat_max!r}):\n"
+        f"        errors.append(f\"Latitude {{latitude}} out of range\")\n",
+    ]
+    if bbox is not None:
+        b_lon_min, b_lon_max, b_lat_min, b_lat_max = bbox
+        checks += [
+            f"    if not ({b_lon_min!r} <= longitude <= {b_lon_max!r}):\n"
+            f"        errors.append(f\"Longitude {{longitude}} outside Beijing bbox\")\n",
+            f"    if not ({b_lat_min!r} <= latitude <= {b_lat_max!r}):\n"
+            f"        errors.append(f\"Latitude {{latitude}} outside Beijing bbox\")\n",
+        ]
+    
+    if strict:
+        on_errors = "        return None, 'VALIDATION_ERROR', '; '.join(errors)\n"
+    else:
+        on_errors = "        return (timestamp, longitude, latitude, False, '; '.join(errors)), None, None\n"
+    
+    validation = "    errors = []\n" + ''.join(checks) + "    if errors:\n" + on_errors
+    
+    # Bbox de Beijing incluse dans les bornes globales: un point dans la bbox
+    # est valide, les autres tests ne tournent que pour les points rejetés
+    # (mêmes motifs que _coord_reason_codes)
+    if bbox is not None and (
+        lon_min <= bbox[0] and bbox[1] <= lon_max
+        and lat_min <= bbox[2] and bbox[3] <= lat_max
+    ):
+        validation = (
+            f"    if not ({bbox[0]!r} <= longitude <= {bbox[1]!r} "
+            f"and {bbox[2]!r} <= latitude <= {bbox[3]!r}):\n"
+            + textwrap.indent(validation, '    ')
+        )
+    
+    src = (
+        "def parse(row):\n"
+        "    if len(row) < 4:\n"
+        "        return None, 'FORMAT_ERROR', f\"Invalid format: expected 4 fields, got {len(row)}\"\n"
+        "    timestamp_str = row[1].strip()\n"
+        "    longitude_str = row[2].strip()\n"
+        "    latitude_str = row[3].strip()\n"
+        # Timestamp canonique conservé en texte (parsé par PostgreSQL / Django)
+        "    if is_canonical(timestamp_str):\n"
+        "        timestamp = timestamp_str\n"
+        "    else:\n"
+        "        try:\n"
+        "            timestamp = parse_timestamp(timestamp_str)\n"
+        "        except ValueError:\n"
+        "            return None, 'TIMESTAMP_ERROR', f\"Invalid timestamp format: {timestamp_str}\"\n"
+        "    try:\n"
+        "        longitude = float(longitude_str)\n"
+        "        latitude = float(latitude_str)\n"
+        "    except ValueError:\n"
+        "        return None, 'COORDINATE_ERROR', "
+        "f\"Invalid coordinates: lon={longitude_str}, lat={latitude_str}\"\n"
+        + validation +
+        "    return (timestamp, longitude, latitude, True, None), None, None\n"
+    )
+    ns = {'parse_timestamp': _parse_tdrive_timestamp, 'is_canonical': _is_canonical_timestamp}
+    exec(src, ns)
+    return ns['parse']
+
+
+def _iter_file_lines(file_path: str):
+    """
+    Itère les lignes d'un fichier via mmap, sans fin de ligne.
+    
+    Les fins de ligne sont trouvées par bytes.find (memchr) sur le fichier
+    mappé; seule la ligne courante est décodée.
+    """
+    with open(file_path, 'rb') as f:
+        # mmap refuse les fichiers vides
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            find = mm.find
+            pos = 0
+            while pos < size:
+                nl = find(b'\n', pos)
+                if nl < 0:
+                    nl = size
+                yield mm[pos:nl].decode('utf-8').rstrip('\r')
+                pos = nl + 1
+
+
+# Codes de rejet des coordonnées (0 = valide)
+COORD_OK = 0
+COORD_LON_RANGE = 1
+COORD_LAT_RANGE = 2
+COORD_BBOX_LON = 3
+COORD_BBOX_LAT = 4
+
+_COORD_REASON_NOTES = np.array([
+    '',
+    'Longitude out of range',
+    'Latitude out of range',
+    'Longitude outside Beijing bbox',
+    'Latitude outside Beijing bbox',
+], dtype=object)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, boundscheck=False, cache=True)
+    def _coord_reason_codes_numba(lon, lat, lon_min, lon_max, lat_min, lat_max,
+                                  use_bbox, bbox_lon_min, bbox_lon_max,
+                                  bbox_lat_min, bbox_lat_max):
+        """Validation des coordonnées en une passe, un code de rejet par point."""
+        # Bornes effectives: la bbox de Beijing est incluse dans les bornes
+        # globales, un seul test suffit pour les points valides
+        in_lon_min, in_lon_max = lon_min, lon_max
+        in_lat_min, in_lat_max = lat_min, lat_max
+        if use_bbox:
+            in_lon_min = max(lon_min, bbox_lon_min)
+            in_lon_max = min(lon_max, bbox_lon_max)
+            in_lat_min = max(lat_min, bbox_lat_min)
+            in_lat_max = min(lat_max, bbox_lat_max)
+        
+        codes = np.zeros(lon.shape[0], dtype=np.uint8)
+        for i in prange(lon.shape[0]):
+            x = lon[i]
+            y = lat[i]
+            # Pas de fastmath: les NaN doivent échouer aux comparaisons
+            if (in_lon_min <= x <= in_lon_max) and (in_lat_min <= y <= in_lat_max):
+                continue
+            if not (lon_min <= x <= lon_max):
+                codes[i] = 1
+            elif not (lat_min <= y <= lat_max):
+                codes[i] = 2
+            elif use_bbox and not (bbox_lon_min <= x <= bbox_lon_max):
+                codes[i] = 3
+            elif use_bbox and not (bbox_lat_min <= y <= bbox_lat_max):
+                codes[i] = 4
+        return codes
+
+
+def _coord_reason_codes(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    bounds: Tuple[float, float, float, float],
+    bbox: Optional[Tuple[float, float, float, float]] = None
+) -> np.ndarray:
+    """
+    Calcule un code de rejet (uint8) par point; 0 = coordonnées valides.
+    
+    Args:
+        lon, lat: Tableaux float64 des coordonnées
+        bounds: (lon_min, lon_max, lat_min, lat_max) globaux
+        bbox: (lon_min, lon_max, lat_min, lat_max) contextuels, ou None
+    
+    Returns:
+        Tableau uint8 de codes COORD_*
+    """
+    use_bbox = bbox is not None
+    bbox = bbox or bounds
+    
+    if NUMBA_AVAILABLE:
+        return _coord_reason_codes_numba(lon, lat, *bounds, use_bbox, *bbox)
+    
+    # Repli numpy: un seul masque sur l'intersection des bornes (4 comparaisons
+    # vectorisées), les codes ne sont calculés que pour les points rejetés
+    lon_min, lon_max = max(bounds[0], bbox[0]), min(bounds[1], bbox[1])
+    lat_min, lat_max = max(bounds[2], bbox[2]), min(bounds[3], bbox[3])
+    valid = (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+    
+    codes = np.zeros(lon.shape[0], dtype=np.uint8)
+    bad = np.flatnonzero(~valid)
+    if bad.size:
+        bad_lon = lon[bad]
+        bad_lat = lat[bad]
+        # Mêmes priorités que le noyau numba
+        conditions = [
+            ~((bad_lon >= bounds[0]) & (bad_lon <= bounds[1])),
+            ~((bad_lat >= bounds[2]) & (bad_lat <= bounds[3])),
+            ~((bad_lon >= bbox[0]) & (bad_lon <= bbox[1])),
+        ]
+        choices = [COORD_LON_RANGE, COORD_LAT_RANGE, COORD_BBOX_LON]
+        codes[bad] = np.select(conditions, choices, default=COORD_BBOX_LAT)
+    return codes
+
+
+# EWKB d'un point 2D avec SRID: ordre des octets, type, SRID, x, y (25 octets, sans padding)
+_EWKB_POINT_DTYPE = np.dtype([
+    ('byte_order', 'u1'),
+    ('geom_type', '<u4'),
+    ('srid', '<u4'),
+    ('x', '<f8'),
+    ('y', '<f8'),
+])
+_EWKB_POINT_WITH_SRID = 0x20000001
+_HEX_BYTES = np.array([f'{i:02X}' for i in range(256)])
+
+
+def _ewkb_hex_points(lon: np.ndarray, lat: np.ndarray, srid: int = 4326) -> np.ndarray:
+    """
+    Encode des points en EWKB hexadécimal, sans objet GEOS ni boucle Python.
+    
+    Args:
+        lon, lat: Tableaux float64 des coordonnées
+        srid: SRID inscrit dans l'EWKB
+    
+    Returns:
+        Tableau de chaînes hexadécimales (50 caractères par point),
+        lisibles directement par PostGIS
+    """
+    records = np.empty(lon.shape[0], dtype=_EWKB_POINT_DTYPE)
+    records['byte_order'] = 1  # little endian
+    records['geom_type'] = _EWKB_POINT_WITH_SRID
+    records['srid'] = srid
+    records['x'] = lon
+    records['y'] = lat
+    
+    # Chaque octet -> 2 caractères; les 25 paires d'une ligne forment une chaîne de 50
+    raw = records.view(np.uint8).reshape(-1, _EWKB_POINT_DTYPE.itemsize)
+    return _HEX_BYTES[raw].view(f'<U{2 * _EWKB_POINT_DTYPE.itemsize}').ravel()
+
+
+def _new_raw_point(
+    taxi_id: str,
+    timestamp,
+    longitude: float,
+    latitude: float,
+    geom: Optional[Point],
+    imported_at: datetime,
+    source_file: Optional[str],
+    is_valid: bool,
+    validation_notes: Optional[str]
+) -> TDriveRawPoint:
+    """
+    Instancie un TDriveRawPoint sans passer par Model.__init__.
+    
+    Les valeurs sont déjà validées: on remplit directement __dict__, ce qui
+    évite la résolution des kwargs et des valeurs par défaut champ par champ.
+    Chaque colonne concrète du modèle doit y figurer (y compris imported_at,
+    dont la valeur par défaut n'est pas appliquée ici).
+    """
+    point = TDriveRawPoint.__new__(TDriveRawPoint)
+    point.__dict__.update({
+        '_state': ModelState(),
+        'id': None,
+        'taxi_id': taxi_id,
+        'timestamp': timestamp,
+        'longitude': longitude,
+        'latitude': latitude,
+        'geom': geom,
+        'imported_at': imported_at,
+        'source_file': source_file,
+        'is_valid': is_valid,
+        'validation_notes': validation_notes,
+    })
+    return point
+
+
+class _PointColumns:
+    """
+    Accumulateur colonne par colonne (SoA) des points d'un fichier.
+    
+    Les coordonnées sont stockées dans des array('d') et taxi_id/source_file
+    une seule fois pour tout le fichier. L'itération produit les tuples
+    attendus par _bulk_insert_points et peut être répétée (repli ORM).
+    """
+    
+    __slots__ = ('taxi_id', 'source_file', 'timestamp', 'longitude', 'latitude', 'is_valid', 'notes')
+    
+    def __init__(self, taxi_id: str, source_file: str):
+        self.taxi_id = taxi_id
+        self.source_file = source_file
+        self.timestamp = []
+        self.longitude = array('d')
+        self.latitude = array('d')
+        self.is_valid = []
+        self.notes = []
+    
+    def __len__(self) -> int:
+        return len(self.timestamp)
+    
+    def __iter__(self):
+        return zip(
+            repeat(self.taxi_id), self.timestamp, self.longitude, self.latitude,
+            repeat(self.source_file), self.is_valid, self.notes
+        )
+    
+    def append(self, timestamp: datetime, longitude: float, latitude: float,
+               is_valid: bool, notes: Optional[str]) -> None:
+        self.timestamp.append(timestamp)
+        self.longitude.append(longitude)
+        self.latitude.append(latitude)
+        self.is_valid.append(is_valid)
+        self.notes.append(notes)
+    
+    def clear(self) -> None:
+        del self.timestamp[:]
+        del self.longitude[:]
+        del self.latitude[:]
+        del self.is_valid[:]
+        del self.notes[:]
 
 
 class TDriveImporter:
@@ -45,7 +476,7 @@ class TDriveImporter:
     Méthodes principales:
         - import_file: Importe un fichier unique
         - import_directory: Importe tous les fichiers d'un répertoire
-        - validate_line: Valide une ligne de données
+        - _build_parser: Compile le parseur qui valide une ligne de données
     """
     
     # Constantes de validation
@@ -62,10 +493,43 @@ class TDriveImporter:
         'max_lat': 41.1
     }
     
-    # Taille du batch pour insertion massive
-    BATCH_SIZE = 1000
+    # Taille du batch pour insertion massive (COPY)
+    BATCH_SIZE = int(os.getenv('TDRIVE_BULK_BATCH_SIZE', '10000'))
+    
+    # Taille des INSERT multi-lignes du repli ORM (bulk_create): autant de
+    # lignes que le permet la limite de 65535 paramètres par requête PostgreSQL
+    ORM_BATCH_SIZE = 65535 // len([
+        field for field in TDriveRawPoint._meta.concrete_fields if not field.primary_key
+    ])
     
-    def __init__(self, strict_validation: bool = False, use_beijing_bbox: bool = True, verbose: bool = False):
+    # Nombre de lignes par morceau lu dans le chemin pandas
+    FRAME_CHUNK_ROWS = 65536
+    
+    # Plafond du nombre de processus d'import (une connexion DB chacun)
+    MAX_WORKERS = int(os.getenv('TDRIVE_IMPORT_MAX_WORKERS', '8'))
+    
+    # COMMIT des données sans attendre le fsync du WAL (données historiques
+    # ré-importables; un crash peut perdre les dernières transactions, jamais
+    # les corrompre)
+    ASYNC_COMMIT = True
+    
+    # Colonnes alimentées par COPY (ordre des champs écrits dans le flux)
+    COPY_COLUMNS = (
+        'taxi_id, timestamp, longitude, latitude, geom, imported_at, '
+        'source_file, is_valid, validation_notes'
+    )
+    
+    # Nombre d'erreurs de validation accumulées avant insertion groupée
+    ERROR_BATCH_SIZE = 1000
+    
+    def __init__(
+        self,
+        strict_validation: bool = False,
+        use_beijing_bbox: bool = True,
+        verbose: bool = False,
+        batch_id: Optional[uuid.UUID] = None,
+        batch_size: Optional[int] = None
+    ):
         """
         Initialise l'importeur.
         
@@ -73,12 +537,28 @@ class TDriveImporter:
             strict_validation: Si True, applique des validations strictes
             use_beijing_bbox: Si True, vérifie que les points sont dans Beijing
             verbose: Si True, affiche tous les messages de debug
+            batch_id: Identifiant de batch à réutiliser (workers de import_directory)
+            batch_size: Nombre de points par COPY (défaut: BATCH_SIZE)
         """
         self.strict_validation = strict_validation
         self.use_beijing_bbox = use_beijing_bbox
-        self.batch_id = uuid.uuid4()
+        self.batch_id = batch_id or uuid.uuid4()
+        if batch_size:
+            self.BATCH_SIZE = batch_size
         self.verbose = verbose
         
+        # Erreurs de validation en attente d'insertion groupée
+        self._pending_errors: List[TDriveValidationError] = []
+        
+        # Parseur de ligne spécialisé pour cette configuration
+        self._parse_row = self._build_parser()
+        
+        # Table cible des COPY (remplacée par la table de staging le cas échéant)
+        self._copy_table = TDriveRawPoint._meta.db_table
+        
+        # Tampon COPY réutilisé d'un batch à l'autre
+        self._copy_buf = io.StringIO()
+        
         if self.verbose:
             print(f"[TDriveImporter] Initialized with batch_id={self.batch_id}")
             print(f"[TDriveImporter] Strict validation: {strict_validation}")
@@ -115,11 +595,20 @@ class TDriveImporter:
         try:
             # Import des données
             with transaction.atomic():
+                if self.ASYNC_COMMIT and connection.vendor == 'postgresql':
+                    # LOCAL: limité à cette transaction, sans effet sur le serveur
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL synchronous_commit = off")
+                
                 if use_pandas:
                     stats = self._process_file_pandas(file_path, taxi_id, import_log)
                 else:
                     stats = self._process_file(file_path, taxi_id, import_log)
             
+            # Les analyses de trajectoires en cache pour ce taxi sont périmées
+            if stats['successful'] and self._copy_table == TDriveRawPoint._meta.db_table:
+                invalidate_trajectory_cache(taxi_id)
+            
             # Mise à jour du log
             end_time = timezone.now()
             duration = (end_time - start_time).total_seconds()
@@ -159,7 +648,10 @@ class TDriveImporter:
             import_log.error_message = error_msg
             import_log.end_time = end_time
             import_log.duration_seconds = duration
-            import_log.save()
+            import_log.save(update_fields=['status', 'error_message', 'end_time', 'duration_seconds'])
+            
+            # Conserver les erreurs de validation relevées avant l'échec
+            self._flush_errors()
             
             return {
                 'success': False,
@@ -168,13 +660,32 @@ class TDriveImporter:
                 'duration': duration
             }
     
-    def import_directory(self, directory_path: str, max_files: Optional[int] = None) -> Dict:
+    def import_directory(
+        self,
+        directory_path: str,
+        max_files: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        drop_indexes: bool = False,
+        use_staging: bool = False
+    ) -> Dict:
         """
         Importe tous les fichiers .txt d'un répertoire.
         
+        Les fichiers sont indépendants (un taxi, un log, une transaction):
+        ils sont répartis sur un pool de processus, chacun avec sa propre
+        connexion à la base.
+        
         Args:
             directory_path: Chemin vers le répertoire contenant les fichiers
             max_files: Nombre maximum de fichiers à importer (None = tous)
+            max_workers: Nombre de processus (None = os.cpu_count() plafonné à
+                MAX_WORKERS, 1 = séquentiel)
+            drop_indexes: Si True, supprime les index secondaires de
+                mobility_tdriverawpoint pendant le chargement et les
+                reconstruit à la fin (gros imports uniquement)
+            use_staging: Si True, les COPY visent une table UNLOGGED (sans WAL)
+                recopiée en une fois dans mobility_tdriverawpoint à la fin;
+                les points ne sont visibles qu'après cette étape
         
         Returns:
             Dict contenant les statistiques globales
@@ -198,26 +709,46 @@ class TDriveImporter:
             'failed_points': 0
         }
         
-        # Import de chaque fichier avec affichage de progression
-        for idx, file_path in enumerate(txt_files, 1):
-            # Affichage tous les 50 fichiers
-            if idx % 50 == 0 or idx == 1 or idx == len(txt_files):
-                print(f"   Progress: {idx}/{len(txt_files)} files ({idx*100//len(txt_files)}%)")
+        dropped_indexes = self._drop_indexes() if drop_indexes and txt_files else []
+        staging_table = self._create_staging_table() if use_staging and txt_files else None
+        
+        try:
+            if max_workers is None:
+                max_workers = min(os.cpu_count() or 1, self.MAX_WORKERS)
+            workers = min(max_workers, len(txt_files))
             
-            try:
-                result = self.import_file(str(file_path))
-                
-                if result['success']:
-                    stats['successful_files'] += 1
-                    stats['total_points'] += result['successful']
-                    stats['failed_points'] += result['failed']
-                else:
-                    stats['failed_files'] += 1
+            # Fermer les connexions avant le fork casserait une transaction
+            # ouverte par l'appelant: import séquentiel dans ce cas
+            if any(conn.in_atomic_block for conn in connections.all()):
+                workers = 1
             
-            except Exception as e:
-                if self.verbose:
-                    print(f"[ERROR] Failed to import {file_path.name}: {str(e)}")
-                stats['failed_files'] += 1
+            if workers <= 1:
+                results = (self._import_one(str(file_path)) for file_path in txt_files)
+                self._collect_directory_results(results, stats)
+            else:
+                # Les connexions ne doivent pas être partagées avec les processus forkés
+                connections.close_all()
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_init_import_worker,
+                    initargs=(
+                        self.strict_validation, self.use_beijing_bbox, self.verbose,
+                        self.batch_id, self.BATCH_SIZE, self._copy_table
+                    )
+                ) as executor:
+                    # Envoi par paquets de fichiers: moins d'aller-retours IPC
+                    results = executor.map(
+                        _import_file_worker,
+                        [str(file_path) for file_path in txt_files],
+                        chunksize=8
+                    )
+                    self._collect_directory_results(results, stats)
+        finally:
+            if staging_table:
+                self._finalize_staging_table(staging_table)
+            if dropped_indexes:
+                self._recreate_indexes(dropped_indexes)
         
         # Calcul de la durée totale
         end_time = timezone.now()
@@ -232,6 +763,114 @@ class TDriveImporter:
             **stats
         }
     
+    def _create_staging_table(self) -> Optional[str]:
+        """
+        Crée une table UNLOGGED de staging pour ce batch et y redirige les COPY.
+        
+        Returns:
+            Nom de la table, ou None si la base n'est pas PostgreSQL
+        """
+        if connection.vendor != 'postgresql':
+            return None
+        
+        table = TDriveRawPoint._meta.db_table
+        staging = f"{table}_staging_{self.batch_id.hex}"
+        with connection.cursor() as cursor:
+            # INCLUDING DEFAULTS: l'id reste tiré de la séquence de la table finale
+            cursor.execute(
+                f"CREATE UNLOGGED TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {table} INCLUDING DEFAULTS)"
+            )
+        
+        self._copy_table = staging
+        return staging
+    
+    def _finalize_staging_table(self, staging: str):
+        """Recopie la table de staging dans la table finale puis la supprime."""
+        table = TDriveRawPoint._meta.db_table
+        self._copy_table = table
+        
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT taxi_id FROM {staging}")
+            taxi_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute(f"INSERT INTO {table} SELECT * FROM {staging}")
+            if self.verbose:
+                print(f"[TDriveImporter] Moved {cursor.rowcount} staged points into {table}")
+            cursor.execute(f"DROP TABLE {staging}")
+        
+        # Points visibles seulement maintenant: invalidation après le commit
+        for taxi_id in taxi_ids:
+            invalidate_trajectory_cache(taxi_id)
+    
+    def _drop_indexes(self) -> List[Tuple[str, str]]:
+        """
+        Supprime les index secondaires de mobility_tdriverawpoint.
+        
+        Les index portant une contrainte (clé primaire, unicité) sont conservés.
+        
+        Returns:
+            Liste de (nom, définition) pour _recreate_indexes
+        """
+        if connection.vendor != 'postgresql':
+            return []
+        
+        table = TDriveRawPoint._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT indexname, indexdef
+                FROM pg_indexes
+                WHERE schemaname = current_schema()
+                  AND tablename = %s
+                  AND indexname NOT IN (
+                      SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass
+                  )
+                """,
+                [table, table]
+            )
+            indexes = cursor.fetchall()
+            
+            for name, _ in indexes:
+                cursor.execute(f'DROP INDEX IF EXISTS {connection.ops.quote_name(name)}')
+        
+        if self.verbose:
+            print(f"[TDriveImporter] Dropped {len(indexes)} indexes on {table}")
+        return indexes
+    
+    def _recreate_indexes(self, indexes: List[Tuple[str, str]]):
+        """Reconstruit les index supprimés par _drop_indexes."""
+        with connection.cursor() as cursor:
+            for name, definition in indexes:
+                if self.verbose:
+                    print(f"[TDriveImporter] Rebuilding index {name}")
+                cursor.execute(definition)
+    
+    def _import_one(self, file_path: str) -> Dict:
+        """Importe un fichier sans laisser remonter d'exception (utilisé par import_directory)."""
+        try:
+            return self.import_file(file_path)
+        except Exception as e:
+            if self.verbose:
+                print(f"[ERROR] Failed to import {os.path.basename(file_path)}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def _collect_directory_results(results, stats: Dict):
+        """Agrège les résultats par fichier dans les statistiques globales."""
+        total = stats['total_files']
+        
+        for idx, result in enumerate(results, 1):
+            # Affichage tous les 50 fichiers
+            if idx % 50 == 0 or idx == 1 or idx == total:
+                print(f"   Progress: {idx}/{total} files ({idx*100//total}%)")
+            
+            if result['success']:
+                stats['successful_files'] += 1
+                stats['total_points'] += result['successful']
+                stats['failed_points'] += result['failed']
+            else:
+                stats['failed_files'] += 1
+    
     def _create_import_log(self, file_name: str, file_path: str) -> TDriveImportLog:
         """Crée un log d'import dans la base de données."""
         import_log = TDriveImportLog.objects.create(
@@ -259,7 +898,10 @@ class TDriveImporter:
         import_log.end_time = end_time
         import_log.duration_seconds = duration
         import_log.status = status
-        import_log.save()
+        import_log.save(update_fields=[
+            'total_lines', 'successful_imports', 'failed_imports',
+            'end_time', 'duration_seconds', 'status'
+        ])
     
     def _process_file(
         self,
@@ -269,155 +911,70 @@ class TDriveImporter:
     ) -> Dict:
         """Traite un fichier ligne par ligne avec validation."""
         stats = {'total': 0, 'successful': 0, 'failed': 0}
-        batch = []
+        batch = _PointColumns(taxi_id, import_log.file_name)
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            
-            for line_num, row in enumerate(reader, 1):
-                stats['total'] += 1
-                
-                # Validation et parsing de la ligne
-                validation_result = self._validate_and_parse_line(
-                    row, 
-                    line_num, 
-                    taxi_id,
-                    import_log
-                )
-                
-                if validation_result['valid']:
-                    batch.append(validation_result['point'])
-                    
-                    # Insertion par batch pour performance
-                    if len(batch) >= self.BATCH_SIZE:
-                        self._bulk_insert_points(batch)
-                        stats['successful'] += len(batch)
-                        batch = []
-                else:
-                    stats['failed'] += 1
-            
-            # Insertion du dernier batch
-            if batch:
-                self._bulk_insert_points(batch)
-                stats['successful'] += len(batch)
+        parse_row = self._parse_row
+        _parse_tdrive_timestamp.cache_clear()
+        _copy_timestamp.cache_clear()
         
-        return stats
-    
-    def _validate_and_parse_line(
-        self,
-        row: List[str],
-        line_num: int,
-        taxi_id: str,
-        import_log: TDriveImportLog
-    ) -> Dict:
-        """
-        Valide et parse une ligne du fichier T-Drive.
+        # Lignes identiques consécutives (taxi à l'arrêt): résultat réutilisé
+        last_raw = None
+        last_result = None
         
-        Format attendu: taxi_id,timestamp,longitude,latitude
-        """
-        try:
-            # Vérification du nombre de champs
-            if len(row) < 4:
-                error_msg = f"Invalid format: expected 4 fields, got {len(row)}"
-                self._log_validation_error(
-                    import_log, line_num, ','.join(row),
-                    'FORMAT_ERROR', error_msg
-                )
-                return {'valid': False, 'point': None, 'error': error_msg}
-            
-            # Extraction des champs
-            file_taxi_id = row[0].strip()
-            timestamp_str = row[1].strip()
-            longitude_str = row[2].strip()
-            latitude_str = row[3].strip()
+        # Format fixe sans guillemets: un split suffit, csv.reader est inutile;
+        # comme avec csv.reader, les champs au-delà du quatrième sont ignorés
+        for line_num, raw in enumerate(_iter_file_lines(file_path), 1):
+            stats['total'] += 1
             
-            # Parsing de la date
-            try:
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-            except ValueError as e:
-                error_msg = f"Invalid timestamp format: {timestamp_str}"
-                self._log_validation_error(
-                    import_log, line_num, ','.join(row),
-                    'TIMESTAMP_ERROR', error_msg
-                )
-                return {'valid': False, 'point': None, 'error': error_msg}
-            
-            # Parsing des coordonnées
-            try:
-                longitude = float(longitude_str)
-                latitude = float(latitude_str)
-            except (ValueError, InvalidOperation) as e:
-                error_msg = f"Invalid coordinates: lon={longitude_str}, lat={latitude_str}"
-                self._log_validation_error(
-                    import_log, line_num, ','.join(row),
-                    'COORDINATE_ERROR', error_msg
-                )
-                return {'valid': False, 'point': None, 'error': error_msg}
-            
-            # Validation des coordonnées
-            validation_errors = []
-            
-            # Validation globale
-            if not (self.MIN_LONGITUDE <= longitude <= self.MAX_LONGITUDE):
-                validation_errors.append(f"Longitude {longitude} out of range")
-            
-            if not (self.MIN_LATITUDE <= latitude <= self.MAX_LATITUDE):
-                validation_errors.append(f"Latitude {latitude} out of range")
+            # Validation et parsing de la ligne
+            if raw == last_raw:
+                point, error_type, error_msg = last_result
+            else:
+                try:
+                    point, error_type, error_msg = parse_row(raw.split(','))
+                except Exception as e:
+                    # Capture des erreurs inattendues
+                    point, error_type, error_msg = None, 'UNKNOWN_ERROR', f"Unexpected error: {str(e)}"
+                    logger.debug("Line %d: %s", line_num, error_msg)
+                last_raw = raw
+                last_result = (point, error_type, error_msg)
             
-            # Validation contextuelle (Beijing)
-            if self.use_beijing_bbox:
-                if not (self.BEIJING_BBOX['min_lon'] <= longitude <= self.BEIJING_BBOX['max_lon']):
-                    validation_errors.append(f"Longitude {longitude} outside Beijing bbox")
-                
-                if not (self.BEIJING_BBOX['min_lat'] <= latitude <= self.BEIJING_BBOX['max_lat']):
-                    validation_errors.append(f"Latitude {latitude} outside Beijing bbox")
+            if error_type is not None:
+                self._log_validation_error(import_log, line_num, raw, error_type, error_msg)
             
-            # Gestion des erreurs de validation
-            if validation_errors:
-                error_msg = '; '.join(validation_errors)
+            if point is not None:
+                batch.append(*point)
                 
-                if self.strict_validation:
-                    # Mode strict: rejeter le point
-                    self._log_validation_error(
-                        import_log, line_num, ','.join(row),
-                        'VALIDATION_ERROR', error_msg
-                    )
-                    return {'valid': False, 'point': None, 'error': error_msg}
-                else:
-                    # Mode permissif: accepter mais marquer comme invalide
-                    point = TDriveRawPoint(
-                        taxi_id=taxi_id,
-                        timestamp=timestamp,
-                        longitude=longitude,
-                        latitude=latitude,
-                        source_file=import_log.file_name,
-                        is_valid=False,
-                        validation_notes=error_msg
-                    )
-                    return {'valid': True, 'point': point, 'error': None}
-            
-            # Création du point valide
-            point = TDriveRawPoint(
-                taxi_id=taxi_id,
-                timestamp=timestamp,
-                longitude=longitude,
-                latitude=latitude,
-                source_file=import_log.file_name,
-                is_valid=True
-            )
-            
-            return {'valid': True, 'point': point, 'error': None}
+                # Insertion par batch pour performance
+                if len(batch) >= self.BATCH_SIZE:
+                    self._bulk_insert_points(batch)
+                    stats['successful'] += len(batch)
+                    batch.clear()
+            else:
+                stats['failed'] += 1
         
-        except Exception as e:
-            # Capture des erreurs inattendues
-            error_msg = f"Unexpected error: {str(e)}"
-            if self.verbose:
-                print(f"[ERROR] Line {line_num}: {error_msg}")
-            self._log_validation_error(
-                import_log, line_num, ','.join(row) if row else '',
-                'UNKNOWN_ERROR', error_msg
+        # Insertion du dernier batch
+        if batch:
+            self._bulk_insert_points(batch)
+            stats['successful'] += len(batch)
+        
+        self._flush_errors()
+        
+        return stats
+    
+    def _build_parser(self):
+        """Compile le parseur de ligne pour la configuration de validation courante."""
+        bbox = None
+        if self.use_beijing_bbox:
+            bbox = (
+                self.BEIJING_BBOX['min_lon'], self.BEIJING_BBOX['max_lon'],
+                self.BEIJING_BBOX['min_lat'], self.BEIJING_BBOX['max_lat']
             )
-            return {'valid': False, 'point': None, 'error': error_msg}
+        return _compile_line_parser(
+            self.strict_validation,
+            (self.MIN_LONGITUDE, self.MAX_LONGITUDE, self.MIN_LATITUDE, self.MAX_LATITUDE),
+            bbox
+        )
     
     def _process_file_pandas(
         self,
@@ -428,6 +985,9 @@ class TDriveImporter:
         """
         Process file using pandas for better performance.
         
+        The file is streamed in chunks of FRAME_CHUNK_ROWS rows: each chunk is
+        validated, copied and released, so peak memory stays at one chunk.
+        
         Args:
             file_path: Path to the file
             taxi_id: Taxi identifier
@@ -439,110 +999,342 @@ class TDriveImporter:
         stats = {'total': 0, 'successful': 0, 'failed': 0}
         
         try:
-            # Read file with pandas
-            df = pd.read_csv(
-                file_path,
-                header=None,
-                names=['taxi_id_file', 'timestamp', 'longitude', 'latitude'],
-                dtype={
-                    'taxi_id_file': str,
-                    'timestamp': str,
-                    'longitude': float,
-                    'latitude': float
-                },
-                na_values=['', 'null', 'NULL', 'None'],
-                keep_default_na=False
-            )
-            
-            stats['total'] = len(df)
-            
-            # Parse timestamps
-            df['timestamp'] = pd.to_datetime(df['timestamp'], format='%Y-%m-%d %H:%M:%S', errors='coerce')
-            
-            # Apply validation
-            df['is_valid'] = True
-            df['validation_notes'] = ''
+            # Savepoint: chunks already copied are rolled back if we fall back
+            with transaction.atomic():
+                for df in self._iter_frames(file_path):
+                    self._process_frame_chunk(df, taxi_id, import_log, stats)
+                
+                self._flush_errors()
             
-            # Coordinate validation
-            coord_mask = (
-                (df['longitude'] >= self.MIN_LONGITUDE) & 
-                (df['longitude'] <= self.MAX_LONGITUDE) &
-                (df['latitude'] >= self.MIN_LATITUDE) & 
-                (df['latitude'] <= self.MAX_LATITUDE)
+            return stats
+        
+        except Exception as e:
+            if self.verbose:
+                print(f"[ERROR] Pandas processing failed: {str(e)}")
+            # The line-by-line pass re-reports every error
+            self._pending_errors = []
+            # Fallback to CSV processing
+            return self._process_file(file_path, taxi_id, import_log)
+    
+    def _process_frame_chunk(
+        self,
+        df: pd.DataFrame,
+        taxi_id: str,
+        import_log: TDriveImportLog,
+        stats: Dict
+    ):
+        """
+        Validate and insert one chunk of a T-Drive file.
+        
+        Args:
+            df: Chunk indexed by 0-based line position in the file
+            taxi_id: Taxi identifier
+            import_log: Import log object
+            stats: Processing statistics, updated in place
+        """
+        stats['total'] += len(df)
+        
+        # Parse timestamps (fixed format, repeated values memoised)
+        df['timestamp'] = pd.to_datetime(
+            df['timestamp'],
+            format='%Y-%m-%d %H:%M:%S',
+            exact=True,
+            cache=True,
+            errors='coerce'
+        )
+        if settings.USE_TZ:
+            # Naive values are in TIME_ZONE (as for the ORM); COPY would read
+            # them in the session time zone, so send them with their offset
+            df['timestamp'] = df['timestamp'].dt.tz_localize(
+                timezone.get_default_timezone_name(),
+                ambiguous=np.ones(len(df), dtype=bool),
+                nonexistent='shift_forward'
             )
-            
-            # Beijing bbox validation
-            if self.use_beijing_bbox:
-                beijing_mask = (
-                    (df['longitude'] >= self.BEIJING_BBOX['min_lon']) & 
-                    (df['longitude'] <= self.BEIJING_BBOX['max_lon']) &
-                    (df['latitude'] >= self.BEIJING_BBOX['min_lat']) & 
-                    (df['latitude'] <= self.BEIJING_BBOX['max_lat'])
-                )
-                coord_mask = coord_mask & beijing_mask
-            
-            # Timestamp validation
-            time_mask = df['timestamp'].notna()
-            
-            # Combined validation
-            valid_mask = coord_mask & time_mask
-            
-            if self.strict_validation:
-                # In strict mode, only keep valid points
-                df_valid = df[valid_mask].copy()
-                df_invalid = df[~valid_mask].copy()
-            else:
-                # In permissive mode, keep all points but mark invalid ones
-                df_valid = df.copy()
-                df_valid.loc[~valid_mask, 'is_valid'] = False
-                df_valid.loc[~valid_mask, 'validation_notes'] = 'Failed coordinate or timestamp validation'
-                df_invalid = pd.DataFrame()
-            
-            # Create TDriveRawPoint objects
-            points = []
-            for _, row in df_valid.iterrows():
-                point = TDriveRawPoint(
-                    taxi_id=taxi_id,
-                    timestamp=row['timestamp'],
-                    longitude=row['longitude'],
-                    latitude=row['latitude'],
-                    source_file=import_log.file_name,
-                    is_valid=row['is_valid'],
-                    validation_notes=row['validation_notes']
-                )
-                points.append(point)
+        
+        # Apply validation
+        df['is_valid'] = True
+        df['validation_notes'] = ''
+        
+        # Coordinate validation (global range + Beijing bbox) in one pass
+        bbox = None
+        if self.use_beijing_bbox:
+            bbox = (
+                self.BEIJING_BBOX['min_lon'], self.BEIJING_BBOX['max_lon'],
+                self.BEIJING_BBOX['min_lat'], self.BEIJING_BBOX['max_lat']
+            )
+        reason_codes = _coord_reason_codes(
+            df['longitude'].to_numpy(dtype=np.float64),
+            df['latitude'].to_numpy(dtype=np.float64),
+            (self.MIN_LONGITUDE, self.MAX_LONGITUDE, self.MIN_LATITUDE, self.MAX_LATITUDE),
+            bbox
+        )
+        
+        # Timestamp validation
+        time_mask = df['timestamp'].notna().to_numpy()
+        
+        # Combined validation
+        valid_mask = (reason_codes == COORD_OK) & time_mask
+        
+        # Reason strings only for rejected rows
+        invalid_notes = _COORD_REASON_NOTES[reason_codes[~valid_mask]]
+        invalid_notes[invalid_notes == ''] = 'Invalid timestamp'
+        
+        if self.strict_validation:
+            # In strict mode, only keep valid points
+            df_valid = df[valid_mask]
+            df_invalid = df[~valid_mask]
+            error_notes = invalid_notes
+        else:
+            # In permissive mode, keep all points but mark invalid ones;
+            # rows without a timestamp cannot be stored and are rejected
+            df.loc[~valid_mask, 'is_valid'] = False
+            df.loc[~valid_mask, 'validation_notes'] = invalid_notes
+            df_valid = df[time_mask]
+            df_invalid = df[~time_mask]
+            error_notes = df_invalid['validation_notes'].to_numpy()
+        
+        # Stream the validated chunk through COPY when possible
+        if not self._copy_insert_frame(df_valid, taxi_id, import_log.file_name):
+            # Build insert rows column-wise (no per-row Series as with iterrows)
+            points = list(zip(
+                repeat(taxi_id),
+                df_valid['timestamp'].tolist(),
+                df_valid['longitude'].tolist(),
+                df_valid['latitude'].tolist(),
+                repeat(import_log.file_name),
+                df_valid['is_valid'].tolist(),
+                df_valid['validation_notes'].tolist()
+            ))
             
             # Bulk insert in batches
             for i in range(0, len(points), self.BATCH_SIZE):
                 batch = points[i:i + self.BATCH_SIZE]
                 self._bulk_insert_points(batch)
+        
+        stats['successful'] += len(df_valid)
+        stats['failed'] += len(df_invalid)
+        
+        # Queue validation errors for invalid points before the chunk is released
+        if not df_invalid.empty:
+            raw_lines = (
+                df_invalid['taxi_id_file'].astype(str) + ',' +
+                df_invalid['timestamp'].astype(str) + ',' +
+                df_invalid['longitude'].astype(str) + ',' +
+                df_invalid['latitude'].astype(str)
+            ).str.slice(0, 500)
             
-            stats['successful'] = len(points)
-            stats['failed'] = len(df_invalid)
-            
-            # Log validation errors for invalid points
-            if not df_invalid.empty:
-                for idx, row in df_invalid.iterrows():
-                    self._log_validation_error(
-                        import_log,
-                        idx + 1,  # line number
-                        f"{row['taxi_id_file']},{row['timestamp']},{row['longitude']},{row['latitude']}",
-                        'VALIDATION_ERROR',
-                        'Failed coordinate or timestamp validation'
-                    )
+            self._pending_errors.extend(
+                TDriveValidationError(
+                    import_log_id=import_log.id,
+                    line_number=line_number,
+                    raw_line=raw_line,
+                    error_type='VALIDATION_ERROR',
+                    error_message=note
+                )
+                for line_number, raw_line, note in zip(
+                    (df_invalid.index + 1).tolist(),
+                    raw_lines.tolist(),
+                    error_notes.tolist()
+                )
+            )
+            if len(self._pending_errors) >= self.ERROR_BATCH_SIZE:
+                self._flush_errors()
+    
+    def _iter_frames(self, file_path: str):
+        """
+        Stream a T-Drive file as typed DataFrame chunks.
+        
+        Uses pyarrow's streaming CSV reader when available, pandas' C parser
+        otherwise. Each chunk is indexed by its 0-based line position in the
+        file. Timestamps stay as strings; they are parsed by
+        pd.to_datetime(errors='coerce') so bad values are flagged per row.
+        """
+        names = ['taxi_id_file', 'timestamp', 'longitude', 'latitude']
+        null_values = ['', 'null', 'NULL', 'None']
+        
+        if PYARROW_AVAILABLE:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
             
-            return stats
+            reader = pacsv.open_csv(
+                file_path,
+                read_options=pacsv.ReadOptions(
+                    column_names=names,
+                    use_threads=True,
+                    block_size=4 << 20
+                ),
+                parse_options=pacsv.ParseOptions(delimiter=','),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={
+                        'taxi_id_file': pa.string(),
+                        'timestamp': pa.string(),
+                        'longitude': pa.float64(),
+                        'latitude': pa.float64()
+                    },
+                    null_values=null_values,
+                    strings_can_be_null=True
+                )
+            )
+            offset = 0
+            for record_batch in reader:
+                df = record_batch.to_pandas()
+                df.index = pd.RangeIndex(offset, offset + len(df))
+                offset += len(df)
+                yield df
+            return
+        
+        # read_csv chunks keep a running RangeIndex across the file
+        yield from pd.read_csv(
+            file_path,
+            header=None,
+            names=names,
+            dtype={
+                'taxi_id_file': str,
+                'timestamp': str,
+                'longitude': 'float64',
+                'latitude': 'float64'
+            },
+            na_values=null_values,
+            keep_default_na=False,
+            engine='c',
+            chunksize=self.FRAME_CHUNK_ROWS
+        )
+    
+    def _copy_insert_frame(self, df: pd.DataFrame, taxi_id: str, source_file: str) -> bool:
+        """
+        Copy a validated DataFrame into mobility_tdriverawpoint in a single COPY stream.
+        
+        Args:
+            df: Frame with timestamp, longitude, latitude, is_valid, validation_notes columns
+            taxi_id: Taxi identifier
+            source_file: Source file name
         
+        Returns:
+            True if the rows were copied, False if the caller must use the batched path
+        """
+        if connection.vendor != 'postgresql' or df.empty:
+            return False
+        
+        lon = df['longitude']
+        lat = df['latitude']
+        lon_values = lon.to_numpy(dtype=np.float64)
+        lat_values = lat.to_numpy(dtype=np.float64)
+        geom = pd.Series(_ewkb_hex_points(lon_values, lat_values), index=df.index)
+        geom = geom.where(np.isfinite(lon_values) & np.isfinite(lat_values))
+        
+        out = pd.DataFrame({
+            'taxi_id': taxi_id,
+            'timestamp': df['timestamp'],
+            'longitude': lon,
+            'latitude': lat,
+            'geom': geom,
+            'imported_at': timezone.now().isoformat(),
+            'source_file': source_file,
+            'is_valid': np.where(df['is_valid'].to_numpy(dtype=bool), 't', 'f'),
+            'validation_notes': df['validation_notes'],
+        })
+        
+        buf = self._reset_copy_buffer()
+        out.to_csv(buf, sep='\t', header=False, index=False, na_rep='\\N')
+        buf.seek(0)
+        
+        try:
+            # Savepoint: a failed COPY must not poison the file transaction
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {self._copy_table} ({self.COPY_COLUMNS}) "
+                    "FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')",
+                    buf
+                )
         except Exception as e:
             if self.verbose:
-                print(f"[ERROR] Pandas processing failed: {str(e)}")
-            # Fallback to CSV processing
-            return self._process_file(file_path, taxi_id, import_log)
+                print(f"[ERROR] DataFrame COPY failed, falling back to batches: {str(e)}")
+            return False
+        
+        return True
     
-    def _bulk_insert_points(self, points: List[TDriveRawPoint]):
-        """Insertion massive de points en base de données."""
+    def _reset_copy_buffer(self) -> io.StringIO:
+        """Vide et retourne le tampon COPY partagé."""
+        buf = self._copy_buf
+        buf.seek(0)
+        buf.truncate(0)
+        return buf
+    
+    def _copy_insert_points(self, rows) -> int:
+        """
+        Insère des points via COPY FROM STDIN (PostgreSQL uniquement).
+        
+        Args:
+            rows: Itérable de tuples
+                (taxi_id, timestamp, longitude, latitude, source_file, is_valid, validation_notes)
+        
+        Returns:
+            Nombre de lignes envoyées
+        """
+        imported_at = timezone.now().isoformat()
+        buf = self._reset_copy_buffer()
+        count = 0
+        use_tz = settings.USE_TZ
+        
+        for taxi_id, timestamp, lon, lat, source_file, is_valid, notes in rows:
+            # float() : repr() d'un scalaire numpy n'est pas un littéral SQL
+            lon, lat = float(lon), float(lat)
+            if math.isfinite(lon) and math.isfinite(lat):
+                geom = f"SRID=4326;POINT({lon!r} {lat!r})"
+            else:
+                geom = '\\N'
+            src = source_file.translate(_COPY_TEXT_ESCAPES) if source_file else '\\N'
+            notes = notes.translate(_COPY_TEXT_ESCAPES) if notes else '\\N'
+            if use_tz:
+                timestamp = _copy_timestamp(timestamp)
+            elif type(timestamp) is not str:
+                # Timestamp canonique déjà en texte: transmis tel quel
+                timestamp = timestamp.isoformat()
+            buf.write(
+                f"{str(taxi_id).translate(_COPY_TEXT_ESCAPES)}\t{timestamp}\t{lon!r}\t{lat!r}\t{geom}\t"
+                f"{imported_at}\t{src}\t{'t' if is_valid else 'f'}\t{notes}\n"
+            )
+            count += 1
+        
+        buf.seek(0)
+        # Savepoint: un COPY en échec ne doit pas invalider la transaction du fichier
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {self._copy_table} ({self.COPY_COLUMNS}) FROM STDIN WITH (FORMAT text)",
+                buf
+            )
+        return count
+    
+    def _bulk_insert_points(self, rows):
+        """
+        Insertion massive de points en base de données (COPY, puis bulk_create en repli).
+        
+        Les instances TDriveRawPoint ne sont construites que si le repli ORM est utilisé.
+        
+        Args:
+            rows: Séquence (ré-itérable) de tuples
+                (taxi_id, timestamp, longitude, latitude, source_file, is_valid, validation_notes)
+        """
+        if connection.vendor == 'postgresql':
+            try:
+                self._copy_insert_points(rows)
+                return
+            except Exception as e:
+                if self.verbose:
+                    print(f"[ERROR] COPY insert failed, falling back to bulk_create: {str(e)}")
+        
+        # La géométrie n'est construite (GEOS) que sur ce chemin; COPY envoie un EWKT
+        imported_at = timezone.now()
+        points = [
+            _new_raw_point(
+                taxi_id, timestamp, lon, lat,
+                Point(lon, lat, srid=4326) if math.isfinite(lon) and math.isfinite(lat) else None,
+                imported_at, source_file, is_valid, notes
+            )
+            for taxi_id, timestamp, lon, lat, source_file, is_valid, notes in rows
+        ]
         try:
-            TDriveRawPoint.objects.bulk_create(points, batch_size=self.BATCH_SIZE)
+            TDriveRawPoint.objects.bulk_create(points, batch_size=self.ORM_BATCH_SIZE)
         except Exception as e:
             if self.verbose:
                 print(f"[ERROR] Bulk insert failed: {str(e)}")
@@ -551,8 +1343,7 @@ class TDriveImporter:
                 try:
                     point.save()
                 except Exception as point_error:
-                    if self.verbose:
-                        print(f"[ERROR] Failed to save point: {point_error}")
+                    logger.debug("Failed to save point: %s", point_error)
     
     def _log_validation_error(
         self,
@@ -562,15 +1353,65 @@ class TDriveImporter:
         error_type: str,
         error_message: str
     ):
-        """Enregistre une erreur de validation dans la base."""
+        """Met en attente une erreur de validation (insérée par _flush_errors)."""
+        # Seul l'id est retenu: la liste en attente ne garde pas le log en vie
+        self._pending_errors.append(TDriveValidationError(
+            import_log_id=import_log.id,
+            line_number=line_number,
+            raw_line=raw_line[:500],  # Limitation pour éviter les textes trop longs
+            error_type=error_type,
+            error_message=error_message
+        ))
+        
+        if len(self._pending_errors) >= self.ERROR_BATCH_SIZE:
+            self._flush_errors()
+    
+    def _flush_errors(self):
+        """Insère en une fois les erreurs de validation en attente."""
+        if not self._pending_errors:
+            return
+        
         try:
-            TDriveValidationError.objects.create(
-                import_log=import_log,
-                line_number=line_number,
-                raw_line=raw_line[:500],  # Limitation pour éviter les textes trop longs
-                error_type=error_type,
-                error_message=error_message
-            )
+            # Savepoint: un échec ne doit pas invalider la transaction du fichier
+            with transaction.atomic():
+                TDriveValidationError.objects.bulk_create(
+                    self._pending_errors,
+                    batch_size=self.ERROR_BATCH_SIZE,
+                    ignore_conflicts=True
+                )
         except Exception as e:
+            logger.warning("Failed to log %d validation errors: %s", len(self._pending_errors), e)
             if self.verbose:
-                print(f"[ERROR] Failed to log validation error: {str(e)}")
+                print(f"[ERROR] Failed to log validation errors: {str(e)}")
+        finally:
+            self._pending_errors = []
+
+
+# Importeur propre à chaque processus du pool de import_directory
+_worker_importer: Optional[TDriveImporter] = None
+
+
+def _init_import_worker(
+    strict_validation: bool,
+    use_beijing_bbox: bool,
+    verbose: bool,
+    batch_id,
+    batch_size: int,
+    copy_table: str
+):
+    """Initialise un processus worker: nouvelle connexion DB et importeur local."""
+    global _worker_importer
+    connections.close_all()
+    _worker_importer = TDriveImporter(
+        strict_validation=strict_validation,
+        use_beijing_bbox=use_beijing_bbox,
+        verbose=verbose,
+        batch_id=batch_id,
+        batch_size=batch_size
+    )
+    _worker_importer._copy_table = copy_table
+
+
+def _import_file_worker(file_path: str) -> Dict:
+    """Point d'entrée d'un worker: importe un fichier T-Drive."""
+    return _worker_importer._import_one(file_path)
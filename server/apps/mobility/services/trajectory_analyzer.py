@@ -8,42 +8,301 @@ Description: Enhanced trajectory analysis using specialized mobility libraries
 """
 from __future__ import annotations
 
+import importlib.util
+import math
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
+import warnings
 
-try:
-    import skmob
+# Missing optional libraries are reported once per process as ImportWarning
+# (ignored by default, hence the filter) rather than logged on every import
+warnings.filterwarnings('once', category=ImportWarning, module=__name__)
+
+# The mobility libraries pull in geopandas/shapely and take seconds to
+# import: only their availability is checked here, each method imports what
+# it needs on first use
+SKMOB_AVAILABLE = importlib.util.find_spec('skmob') is not None
+if not SKMOB_AVAILABLE:
+    warnings.warn("scikit-mobility not available", ImportWarning)
+
+MOVINGPANDAS_AVAILABLE = importlib.util.find_spec('movingpandas') is not None
+if not MOVINGPANDAS_AVAILABLE:
+    warnings.warn("movingpandas not available", ImportWarning)
+
+TRACKINTEL_AVAILABLE = importlib.util.find_spec('trackintel') is not None
+if not TRACKINTEL_AVAILABLE:
+    warnings.warn("trackintel not available", ImportWarning)
+
+# Only used for Arrow-backed string columns (no import needed)
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+if TYPE_CHECKING:
     from skmob import TrajDataFrame
-    from skmob.preprocessing import detection, clustering
-    from skmob.measures.individual import radius_of_gyration, number_of_locations
-    SKMOB_AVAILABLE = True
-except ImportError:
-    SKMOB_AVAILABLE = False
-    TrajDataFrame = pd.DataFrame
-    logging.warning("scikit-mobility not available")
-
-try:
-    import movingpandas as mpd
     from movingpandas import TrajectoryCollection
-    MOVINGPANDAS_AVAILABLE = True
-except ImportError:
-    MOVINGPANDAS_AVAILABLE = False
-    logging.warning("movingpandas not available")
 
-try:
-    import trackintel as ti
-    from trackintel.preprocessing import positionfixes
-    TRACKINTEL_AVAILABLE = True
-except ImportError:
-    TRACKINTEL_AVAILABLE = False
-    logging.warning("trackintel not available")
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Avg, Count, Max, Min, Variance
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.mobility.models import TDriveRawPoint
+from apps.mobility.services import _kernels
+from apps.mobility.services._kernels import EARTH_RADIUS_KM
+
+# Analysis results only change when the taxi's points do: cache for an hour
+# and bump a per-taxi version to drop every (date, params) entry at once
+ANALYSIS_CACHE_TIMEOUT = 3600
+
+
+def _analysis_cache_version(taxi_id: str) -> int:
+    """Current cache version for a taxi's analysis entries."""
+    return cache.get_or_set(f"traj:version:{taxi_id}", 1, timeout=None)
+
+
+def invalidate_trajectory_cache(taxi_id: str):
+    """Drop every cached analysis of a taxi (all dates and parameters)."""
+    try:
+        cache.incr(f"traj:version:{taxi_id}")
+    except ValueError:
+        # No version yet: nothing has been cached for this taxi
+        pass
+
+
+@receiver(post_save, sender=TDriveRawPoint)
+@receiver(post_delete, sender=TDriveRawPoint)
+def _invalidate_on_point_change(sender, instance, **kwargs):
+    invalidate_trajectory_cache(instance.taxi_id)
+
+
+def _read_database() -> str:
+    """
+    Database alias for uncached analysis reads: 'replica' when configured.
+    
+    Results stored in the analysis cache are computed from 'default' instead:
+    the cache is invalidated when the primary commits, and a lagging replica
+    would let the pre-import result be cached under the new version.
+    """
+    return 'replica' if 'replica' in settings.DATABASES else 'default'
+
+
+# Results derived from a TrajectoryCollection, keyed by the collection's id().
+# Segmented collections are held weakly; weakref.finalize on the source drops
+# its entries before the id can be reused
+_segment_cache: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_metrics_cache: Dict[int, Dict] = {}
+_tracked_collections = set()
 
-from django.db import models
-from django.contrib.gis.geos import LineString, Point
-from apps.mobility.models import TDriveRawPoint, TDriveTrajectory
+
+def _forget_collection(collection_id: int):
+    _tracked_collections.discard(collection_id)
+    _metrics_cache.pop(collection_id, None)
+    for key in [key for key in list(_segment_cache.keys()) if key[0] == collection_id]:
+        _segment_cache.pop(key, None)
+
+
+def _track_collection(collection) -> bool:
+    """Register the finalizer for a source collection; False if it cannot be weakly referenced."""
+    collection_id = id(collection)
+    if collection_id not in _tracked_collections:
+        try:
+            weakref.finalize(collection, _forget_collection, collection_id)
+        except TypeError:
+            return False
+        _tracked_collections.add(collection_id)
+    return True
+
+
+# One record per raw point: epoch nanoseconds, longitude, latitude
+_POINT_ROW_DTYPE = np.dtype([('t', 'i8'), ('lng', 'f8'), ('lat', 'f8')])
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _epoch_ns(ts: datetime) -> int:
+    """Convert an aware datetime to integer epoch nanoseconds without float rounding."""
+    return (ts - _EPOCH) // _ONE_MICROSECOND * 1_000
+
+
+def _as_traj_dataframe(df: pd.DataFrame) -> TrajDataFrame:
+    """
+    Re-type a DataFrame as a TrajDataFrame in place.
+    
+    The TrajDataFrame constructor renames (copies) every column and re-parses
+    the datetime column. The frames built here already use skmob's default
+    column names ('lat', 'lng', 'datetime') with float64 and UTC datetime64
+    dtypes, so only the class and its metadata need setting.
+    """
+    if not SKMOB_AVAILABLE:
+        return df
+    
+    from skmob import TrajDataFrame
+    
+    df.__class__ = TrajDataFrame
+    df._parameters = {}
+    df._crs = {'init': 'epsg:4326'}
+    return df
+
+
+def _empty_stops() -> Dict[str, np.ndarray]:
+    """Stop columns with no rows."""
+    return {
+        'lat': np.empty(0),
+        'lng': np.empty(0),
+        'start': np.empty(0, dtype='datetime64[ns]'),
+        'end': np.empty(0, dtype='datetime64[ns]'),
+        'duration_min': np.empty(0)
+    }
+
+
+def _stop_records(stops: Dict[str, np.ndarray]) -> List[Dict]:
+    """Stop columns as the list of dicts returned by the analysis."""
+    return _columns_to_records({
+        'latitude': stops['lat'],
+        'longitude': stops['lng'],
+        'start_time': stops['start'],
+        'end_time': stops['end'],
+        'duration_minutes': stops['duration_min']
+    })
+
+
+def _columns_to_records(columns: Dict[str, np.ndarray]) -> List[Dict]:
+    """Turn SoA columns into a list of dicts; datetime64 becomes UTC Timestamps."""
+    values = [
+        pd.to_datetime(column, utc=True).tolist()
+        if np.issubdtype(column.dtype, np.datetime64) else column.tolist()
+        for column in columns.values()
+    ]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+STOP_RADIUS_KM = 0.2  # 200 meters
+DUPLICATE_RADIUS_KM = 0.01  # 10 meters
+
+
+def _haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km between broadcastable arrays of degrees."""
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    dlat = lat2 - lat1
+    dlng = np.radians(lng2) - np.radians(lng1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _radius_of_gyration_km(lat: np.ndarray, lng: np.ndarray) -> float:
+    """Radius of gyration around the centre of mass, equirectangular projection."""
+    clat, clng = lat.mean(), lng.mean()
+    dy = np.radians(lat - clat) * EARTH_RADIUS_KM
+    dx = np.radians(lng - clng) * EARTH_RADIUS_KM * np.cos(np.radians(clat))
+    return float(np.sqrt(np.mean(dx * dx + dy * dy)))
+
+
+def _stop_candidate_mask(lat: np.ndarray, lng: np.ndarray, ds: float) -> np.ndarray:
+    """
+    Mask out near-duplicate points and isolated GPS jumps before the stop scan.
+    
+    A point within 10 m of both neighbours is a near-duplicate. A point
+    farther than ds from both neighbours is a jump only when the neighbours
+    themselves are within ds of each other (the track returns to where it
+    was); sparse drive samples, whose neighbours are far apart too, are kept
+    so they still separate consecutive stops. End points are always kept.
+    """
+    keep = np.ones(len(lat), dtype=bool)
+    if len(lat) < 3:
+        return keep
+    
+    step = _haversine_km(lat[:-1], lng[:-1], lat[1:], lng[1:])
+    before, after = step[:-1], step[1:]
+    across = _haversine_km(lat[:-2], lng[:-2], lat[2:], lng[2:])
+    keep[1:-1] = ~(
+        ((before < DUPLICATE_RADIUS_KM) & (after < DUPLICATE_RADIUS_KM)) |
+        ((before > ds) & (after > ds) & (across <= ds))
+    )
+    return keep
+
+
+def _medoid_index(lat: np.ndarray, lng: np.ndarray) -> int:
+    """Index of the point minimising the summed distance to all the others."""
+    pairwise = _haversine_km(lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+    return int(np.argmin(pairwise.sum(axis=1)))
+
+
+def _detect_stops_fast(lat: np.ndarray, lng: np.ndarray, t: np.ndarray,
+                       ds: float, dt: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Diameter-based stop detection (Hariharan & Toyama) on plain arrays.
+    
+    A stop is a maximal run of points whose diameter stays within ds and
+    whose duration reaches dt. The distances from the next candidate point
+    to the current window are cached, so advancing the left edge reuses
+    them instead of recomputing the window. The scan runs in the compiled
+    kernel when numba is installed.
+    
+    Args:
+        lat: Latitudes in degrees, ordered by time
+        lng: Longitudes in degrees
+        t: Timestamps as epoch seconds
+        ds: Maximum stop diameter in km
+        dt: Minimum stop duration in seconds
+    
+    Returns:
+        Tuple (start_idx, end_idx, stop_lat, stop_lng); indexes point into
+        the input arrays and are inclusive, coordinates are the medoids
+    """
+    idx = np.flatnonzero(_stop_candidate_mask(lat, lng, ds))
+    lat_k, lng_k, t_k = lat[idx], lng[idx], t[idx]
+    n = len(idx)
+    
+    if _kernels.NUMBA_AVAILABLE:
+        start, end, stop_lat, stop_lng = _kernels.stop_scan(lat_k, lng_k, t_k, dt, ds)
+        return idx[start], idx[end], stop_lat, stop_lng
+    
+    starts, ends, stop_lat, stop_lng = [], [], [], []
+    left = right = 0
+    row = None  # distances from point right + 1 to the window [left, right]
+    
+    while left < n - 1:
+        while right + 1 < n:
+            if row is None:
+                row = _haversine_km(lat_k[right + 1], lng_k[right + 1],
+                                    lat_k[left:right + 1], lng_k[left:right + 1])
+            if row.max() > ds:
+                break
+            right += 1
+            row = None
+        
+        if t_k[right] - t_k[left] >= dt:
+            medoid = left + _medoid_index(lat_k[left:right + 1], lng_k[left:right + 1])
+            starts.append(idx[left])
+            ends.append(idx[right])
+            stop_lat.append(lat_k[medoid])
+            stop_lng.append(lng_k[medoid])
+            left = right = right + 1
+            row = None
+        elif right == n - 1:
+            # Shrinking the window from the left can only shorten it
+            break
+        else:
+            left += 1
+            if left > right:
+                right = left
+                row = None
+            elif row is not None:
+                row = row[1:]
+    
+    return (np.asarray(starts, dtype=np.intp), np.asarray(ends, dtype=np.intp),
+            np.asarray(stop_lat, dtype=np.float64), np.asarray(stop_lng, dtype=np.float64))
 
 
 class TrajectoryAnalyzer:
@@ -71,17 +330,14 @@ class TrajectoryAnalyzer:
         self.min_points = min_points_per_trajectory
         self.stop_threshold = stop_detection_threshold
         self.max_speed = max_speed_kmh
-        
-        if not SKMOB_AVAILABLE:
-            logging.error("scikit-mobility is required for trajectory analysis")
-        
-        if not MOVINGPANDAS_AVAILABLE:
-            logging.error("movingpandas is required for trajectory operations")
     
     def analyze_taxi_trajectories(self, taxi_id: str, date: Optional[datetime] = None) -> Dict:
         """
         Analyze trajectories for a specific taxi using scikit-mobility.
         
+        Results are cached per (taxi, date, analyzer parameters) until the
+        taxi's points change.
+        
         Args:
             taxi_id: Taxi identifier
             date: Specific date to analyze (None for all dates)
@@ -89,69 +345,203 @@ class TrajectoryAnalyzer:
         Returns:
             Dictionary with trajectory analysis results
         """
+        key = (
+            f"traj:{taxi_id}:{date.isoformat() if date else 'all'}:"
+            f"{self.min_points}:{self.stop_threshold}:{self.max_speed}"
+        )
+        version = _analysis_cache_version(taxi_id)
+        
+        result = cache.get(key, version=version)
+        if result is None:
+            result = self._analyze_taxi_trajectories(taxi_id, date)
+            # Errors (missing library, too few points) are not cached
+            if 'error' not in result:
+                cache.set(key, result, timeout=ANALYSIS_CACHE_TIMEOUT, version=version)
+        
+        return result
+    
+    def analyze_fleet(self, taxi_ids: List[str], date: Optional[datetime] = None,
+                      workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Analyze several taxis in parallel, one process per core.
+        
+        Taxis are independent and the analysis is CPU-bound, so they are
+        spread over a process pool; each worker opens its own DB connection.
+        
+        Args:
+            taxi_ids: Taxi identifiers
+            date: Specific date to analyze (None for all dates)
+            workers: Number of processes (None = os.cpu_count(), 1 = sequential);
+                always sequential inside transaction.atomic()
+        
+        Returns:
+            Dictionary mapping each taxi_id to its analysis result
+        """
+        workers = min(workers or os.cpu_count() or 1, len(taxi_ids))
+        
+        # Forking requires closing this process's connections, which would
+        # break a caller's open transaction (e.g. ATOMIC_REQUESTS): stay
+        # sequential in that case
+        if any(conn.in_atomic_block for conn in connections.all()):
+            workers = 1
+        
+        if workers <= 1:
+            results = (self._analyze_one(taxi_id, date) for taxi_id in taxi_ids)
+            return dict(zip(taxi_ids, results))
+        
+        # Connections must not be shared with the forked processes
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_analysis_worker,
+            initargs=(self.min_points, self.stop_threshold, self.max_speed)
+        ) as executor:
+            results = executor.map(_analyze_taxi_worker, taxi_ids, repeat(date))
+            return dict(zip(taxi_ids, results))
+    
+    def _analyze_one(self, taxi_id: str, date: Optional[datetime] = None) -> Dict:
+        """Analyze one taxi without letting exceptions escape (used by analyze_fleet)."""
+        try:
+            return self.analyze_taxi_trajectories(taxi_id, date)
+        except Exception as e:
+            logging.error(f"Error analyzing taxi {taxi_id}: {e}")
+            return {"error": str(e)}
+    
+    def _analyze_taxi_trajectories(self, taxi_id: str, date: Optional[datetime] = None) -> Dict:
+        """Uncached analysis behind analyze_taxi_trajectories."""
         if not SKMOB_AVAILABLE:
             return {"error": "scikit-mobility not available"}
         
         # Query raw points
-        query = TDriveRawPoint.objects.filter(taxi_id=taxi_id, is_valid=True)
+        # Cached result: read from the primary (see _read_database)
+        query = TDriveRawPoint.objects.using('default').filter(taxi_id=taxi_id, is_valid=True)
         if date:
             query = query.filter(timestamp__date=date)
         
-        points = query.order_by('timestamp').values('timestamp', 'longitude', 'latitude')
-        
-        if len(points) < self.min_points:
-            return {"error": f"Insufficient points: {len(points)} < {self.min_points}"}
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(list(points))
-        df.rename(columns={
-            'timestamp': 'datetime',
-            'longitude': 'lng',
-            'latitude': 'lat'
-        }, inplace=True)
-        
-        # Create TrajDataFrame
-        tdf = TrajDataFrame(df, latitude='lat', longitude='lng', datetime='datetime')
+        total = query.count()
+        if total < self.min_points:
+            return {"error": f"Insufficient points: {total} < {self.min_points}"}
+        
+        # Stream rows straight into columnar arrays (no list of dicts)
+        rows = query.order_by('timestamp').values_list(
+            'timestamp', 'longitude', 'latitude'
+        ).iterator(chunk_size=10_000)
+        data = np.fromiter(
+            ((_epoch_ns(ts), lon, lat) for ts, lon, lat in rows),
+            dtype=_POINT_ROW_DTYPE
+        )
+        df = pd.DataFrame({
+            'datetime': pd.to_datetime(data['t'].view('datetime64[ns]'), utc=True),
+            'lng': data['lng'],
+            'lat': data['lat']
+        })
+        
+        tdf = _as_traj_dataframe(df)
         
         # Calculate mobility metrics
         metrics = self._calculate_mobility_metrics(tdf, taxi_id)
         
         # Detect stops
-        stops = self._detect_stops(tdf)
+        stops = self._detect_stops_arrays(tdf)
         
-        # Extract OD pairs
-        od_pairs = self._extract_od_pairs(tdf)
+        # Extract OD pairs from the same stops (no second detection pass)
+        od_pairs = self._extract_od_pairs(stops)
         
         return {
             'taxi_id': taxi_id,
             'date': date,
             'total_points': len(tdf),
             'metrics': metrics,
-            'stops': stops,
+            'stops': _stop_records(stops),
             'od_pairs': od_pairs
         }
     
+    def quick_metrics(self, taxi_id: str, date: Optional[datetime] = None) -> Dict:
+        """
+        Compute summary metrics for a taxi in the database, without loading points.
+        
+        The radius of gyration uses the equirectangular approximation around
+        the centre of mass: Var(lat) + cos²(lat_c)·Var(lng), scaled to km.
+        
+        Args:
+            taxi_id: Taxi identifier
+            date: Specific date to analyze (None for all dates)
+        
+        Returns:
+            Dictionary with the same metric keys as the full analysis
+        """
+        query = TDriveRawPoint.objects.using(_read_database()).filter(taxi_id=taxi_id, is_valid=True)
+        if date:
+            query = query.filter(timestamp__date=date)
+        
+        stats = query.aggregate(
+            total_points=Count('id'),
+            min_latitude=Min('latitude'),
+            max_latitude=Max('latitude'),
+            min_longitude=Min('longitude'),
+            max_longitude=Max('longitude'),
+            first_timestamp=Min('timestamp'),
+            last_timestamp=Max('timestamp'),
+            mean_latitude=Avg('latitude'),
+            var_latitude=Variance('latitude'),
+            var_longitude=Variance('longitude')
+        )
+        
+        if not stats['total_points']:
+            return {"error": f"No valid points for taxi {taxi_id}"}
+        
+        # Distinct (lat, lng) pairs, as counted by skmob's number_of_locations
+        number_of_locations = query.values('latitude', 'longitude').distinct().count()
+        
+        cos_lat = math.cos(math.radians(stats['mean_latitude']))
+        gyration_deg2 = stats['var_latitude'] + cos_lat * cos_lat * stats['var_longitude']
+        duration_hours = (stats['last_timestamp'] - stats['first_timestamp']).total_seconds() / 3600
+        
+        return {
+            'total_points': stats['total_points'],
+            'radius_of_gyration_km': EARTH_RADIUS_KM * math.radians(1) * math.sqrt(max(gyration_deg2, 0.0)),
+            'number_of_locations': number_of_locations,
+            'duration_hours': duration_hours,
+            'points_per_hour': stats['total_points'] / duration_hours if duration_hours > 0 else 0,
+            'max_latitude': stats['max_latitude'],
+            'min_latitude': stats['min_latitude'],
+            'max_longitude': stats['max_longitude'],
+            'min_longitude': stats['min_longitude']
+        }
+    
     def _calculate_mobility_metrics(self, tdf: TrajDataFrame, taxi_id: str) -> Dict:
         """Calculate comprehensive mobility metrics."""
         metrics = {}
         
         try:
             # Radius of gyration
-            metrics['radius_of_gyration_km'] = radius_of_gyration(tdf)
+            metrics['radius_of_gyration_km'] = _radius_of_gyration_km(
+                tdf['lat'].to_numpy(dtype=np.float64),
+                tdf['lng'].to_numpy(dtype=np.float64)
+            )
             
             # Number of distinct locations
+            from skmob.measures.individual import number_of_locations
             metrics['number_of_locations'] = number_of_locations(tdf)
             
+            # Temporal and spatial extent in a single aggregation
+            extent = tdf.agg({
+                'lat': ['min', 'max'],
+                'lng': ['min', 'max'],
+                'datetime': ['min', 'max']
+            })
+            
             # Temporal metrics
-            time_range = tdf['datetime'].max() - tdf['datetime'].min()
+            time_range = extent.at['max', 'datetime'] - extent.at['min', 'datetime']
             metrics['duration_hours'] = time_range.total_seconds() / 3600
             metrics['points_per_hour'] = len(tdf) / metrics['duration_hours'] if metrics['duration_hours'] > 0 else 0
             
             # Spatial extent
-            metrics['max_latitude'] = tdf['lat'].max()
-            metrics['min_latitude'] = tdf['lat'].min()
-            metrics['max_longitude'] = tdf['lng'].max()
-            metrics['min_longitude'] = tdf['lng'].min()
+            metrics['max_latitude'] = extent.at['max', 'lat']
+            metrics['min_latitude'] = extent.at['min', 'lat']
+            metrics['max_longitude'] = extent.at['max', 'lng']
+            metrics['min_longitude'] = extent.at['min', 'lng']
             
         except Exception as e:
             logging.error(f"Error calculating metrics for taxi {taxi_id}: {e}")
@@ -159,66 +549,65 @@ class TrajectoryAnalyzer:
         
         return metrics
     
-    def _detect_stops(self, tdf: TrajDataFrame) -> List[Dict]:
-        """Detect stops in trajectory using scikit-mobility."""
-        if not SKMOB_AVAILABLE:
-            return []
+    def _detect_stops_arrays(self, tdf: TrajDataFrame) -> Dict[str, np.ndarray]:
+        """
+        Detect stops in trajectory with the vectorised diameter scan.
+        
+        Returns:
+            Columns 'lat', 'lng' (float64), 'start', 'end' (UTC datetime64)
+            and 'duration_min' (float64), one entry per stop
+        """
+        if len(tdf) < 2:
+            return _empty_stops()
         
         try:
-            # Detect stops using time and distance thresholds
-            stops_tdf = detection.stops(
-                tdf, 
-                minutes_for_a_stop=self.stop_threshold / 60,  # Convert to minutes
-                spatial_radius_km=0.2,  # 200 meters
-                leaving_time=True
+            t = tdf['datetime'].values  # UTC datetime64[ns]
+            start, end, stop_lat, stop_lng = _detect_stops_fast(
+                tdf['lat'].to_numpy(dtype=np.float64),
+                tdf['lng'].to_numpy(dtype=np.float64),
+                t.view('i8') // 1_000_000_000,
+                ds=STOP_RADIUS_KM,
+                dt=self.stop_threshold
             )
             
-            stops = []
-            for _, stop in stops_tdf.iterrows():
-                stops.append({
-                    'latitude': stop['lat'],
-                    'longitude': stop['lng'],
-                    'start_time': stop['datetime'],
-                    'end_time': stop['leaving_datetime'],
-                    'duration_minutes': (stop['leaving_datetime'] - stop['datetime']).total_seconds() / 60
-                })
+            # Leaving time is the first point after the stop, as in skmob
+            start_t = t[start]
+            end_t = t[np.minimum(end + 1, len(t) - 1)]
             
-            return stops
+            return {
+                'lat': stop_lat,
+                'lng': stop_lng,
+                'start': start_t,
+                'end': end_t,
+                'duration_min': (end_t - start_t) / np.timedelta64(60, 's')
+            }
         
         except Exception as e:
             logging.error(f"Error detecting stops: {e}")
-            return []
+            return _empty_stops()
     
-    def _extract_od_pairs(self, tdf: TrajDataFrame) -> List[Dict]:
-        """Extract Origin-Destination pairs from trajectory."""
-        if len(tdf) < 2:
-            return []
-        
-        od_pairs = []
-        
+    def _extract_od_pairs(self, stops: Dict[str, np.ndarray]) -> List[Dict]:
+        """Extract Origin-Destination pairs (consecutive stops) from detected stops."""
         try:
-            # Simple OD extraction: consecutive stops or significant moves
-            stops = self._detect_stops(tdf)
+            if len(stops['lat']) < 2:
+                return []
             
-            if len(stops) >= 2:
-                for i in range(len(stops) - 1):
-                    origin = stops[i]
-                    destination = stops[i + 1]
-                    
-                    od_pairs.append({
-                        'origin_lat': origin['latitude'],
-                        'origin_lng': origin['longitude'],
-                        'destination_lat': destination['latitude'],
-                        'destination_lng': destination['longitude'],
-                        'departure_time': origin['end_time'],
-                        'arrival_time': destination['start_time'],
-                        'trip_duration_minutes': (destination['start_time'] - origin['end_time']).total_seconds() / 60
-                    })
+            departure = stops['end'][:-1]
+            arrival = stops['start'][1:]
+            
+            return _columns_to_records({
+                'origin_lat': stops['lat'][:-1],
+                'origin_lng': stops['lng'][:-1],
+                'destination_lat': stops['lat'][1:],
+                'destination_lng': stops['lng'][1:],
+                'departure_time': departure,
+                'arrival_time': arrival,
+                'trip_duration_minutes': (arrival - departure) / np.timedelta64(60, 's')
+            })
         
         except Exception as e:
             logging.error(f"Error extracting OD pairs: {e}")
-        
-        return od_pairs
+            return []
     
     def create_trajectory_collection(self, taxi_ids: List[str], 
                                    start_date: datetime, 
@@ -237,27 +626,24 @@ class TrajectoryAnalyzer:
         if not MOVINGPANDAS_AVAILABLE:
             return None
         
+        from movingpandas import TrajectoryCollection
+        
         try:
             # Query points for all specified taxis
-            points = TDriveRawPoint.objects.filter(
+            points = TDriveRawPoint.objects.using(_read_database()).filter(
                 taxi_id__in=taxi_ids,
                 timestamp__range=(start_date, end_date),
                 is_valid=True
-            ).order_by('taxi_id', 'timestamp').values(
+            ).order_by('taxi_id').values_list(
                 'taxi_id', 'timestamp', 'longitude', 'latitude'
-            )
+            ).iterator(chunk_size=50_000)
             
-            if not points:
+            # Each Trajectory sorts its own points by time: only grouping by
+            # taxi is asked of the database
+            df = pd.DataFrame.from_records(points, columns=['taxi_id', 't', 'longitude', 'latitude'])
+            if df.empty:
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(list(points))
-            df.rename(columns={
-                'timestamp': 't',
-                'longitude': 'longitude',
-                'latitude': 'latitude'
-            }, inplace=True)
-            
             # Create TrajectoryCollection
             collection = TrajectoryCollection(
                 df, 
@@ -289,11 +675,18 @@ class TrajectoryAnalyzer:
         if not MOVINGPANDAS_AVAILABLE:
             return collection
         
+        key = (id(collection), time_threshold_minutes)
+        segmented = _segment_cache.get(key)
+        if segmented is not None:
+            return segmented
+        
         try:
             # Segment trajectories by time gaps
             segmented = collection.split_by_time_gap(
                 tolerance=timedelta(minutes=time_threshold_minutes)
             )
+            if _track_collection(collection):
+                _segment_cache[key] = segmented
             return segmented
         
         except Exception as e:
@@ -304,6 +697,9 @@ class TrajectoryAnalyzer:
         """
         Calculate comprehensive metrics for a trajectory collection.
         
+        Results are memoised per collection object until it is garbage
+        collected; the returned dictionary is shared and must not be mutated.
+        
         Args:
             collection: TrajectoryCollection to analyze
         
@@ -313,6 +709,16 @@ class TrajectoryAnalyzer:
         if not MOVINGPANDAS_AVAILABLE:
             return {"error": "movingpandas not available"}
         
+        metrics = _metrics_cache.get(id(collection))
+        if metrics is None:
+            metrics = self._compute_trajectory_metrics(collection)
+            if 'error' not in metrics and _track_collection(collection):
+                _metrics_cache[id(collection)] = metrics
+        
+        return metrics
+    
+    def _compute_trajectory_metrics(self, collection: TrajectoryCollection) -> Dict:
+        """Uncached computation behind calculate_trajectory_metrics."""
         metrics = {
             'total_trajectories': len(collection.trajectories),
             'total_points': 0,
@@ -322,28 +728,73 @@ class TrajectoryAnalyzer:
         }
         
         try:
-            for traj in collection.trajectories:
-                traj_metrics = {
-                    'taxi_id': traj.id,
-                    'points_count': len(traj.df),
-                    'distance_km': traj.get_length() / 1000,  # Convert to km
-                    'duration_hours': (traj.get_end_time() - traj.get_start_time()).total_seconds() / 3600,
-                    'start_time': traj.get_start_time(),
-                    'end_time': traj.get_end_time(),
-                    'avg_speed_kmh': 0
-                }
-                
-                # Calculate average speed
-                if traj_metrics['duration_hours'] > 0:
-                    traj_metrics['avg_speed_kmh'] = traj_metrics['distance_km'] / traj_metrics['duration_hours']
-                
-                metrics['total_points'] += traj_metrics['points_count']
-                metrics['total_distance_km'] += traj_metrics['distance_km']
-                metrics['total_duration_hours'] += traj_metrics['duration_hours']
-                metrics['trajectory_details'].append(traj_metrics)
+            if not metrics['total_trajectories']:
+                return metrics
+            
+            # One flat frame for the whole collection, then a single groupby
+            df = pd.concat([
+                pd.DataFrame({
+                    'tid': traj.id,
+                    't': traj.df.index,
+                    'lat': traj.df.geometry.y.to_numpy(),
+                    'lng': traj.df.geometry.x.to_numpy()
+                })
+                for traj in collection.trajectories
+            ], ignore_index=True)
+            if PYARROW_AVAILABLE:
+                # Arrow-backed ids: the groupby hashes a string buffer, not Python objects
+                df['tid'] = df['tid'].astype('string[pyarrow]')
+            
+            # Haversine between consecutive rows in one shot; the segment
+            # leading into each trajectory's first point spans two taxis
+            lat = df['lat'].to_numpy()
+            lng = df['lng'].to_numpy()
+            seg_km = np.zeros(len(df))
+            seg_km[1:] = _haversine_km(lat[:-1], lng[:-1], lat[1:], lng[1:])
+            first_rows = np.cumsum([len(traj.df) for traj in collection.trajectories])[:-1]
+            seg_km[first_rows] = 0.0
+            df['seg_km'] = seg_km
+            
+            per_traj = df.groupby('tid', sort=False).agg(
+                points_count=('lat', 'size'),
+                distance_km=('seg_km', 'sum'),
+                start_time=('t', 'min'),
+                end_time=('t', 'max')
+            )
+            per_traj['duration_hours'] = (
+                per_traj['end_time'] - per_traj['start_time']
+            ).dt.total_seconds() / 3600
+            per_traj['avg_speed_kmh'] = per_traj['distance_km'].div(
+                per_traj['duration_hours'].where(per_traj['duration_hours'] > 0)
+            ).fillna(0.0)
+            
+            metrics['total_points'] = int(per_traj['points_count'].sum())
+            metrics['total_distance_km'] = float(per_traj['distance_km'].sum())
+            metrics['total_duration_hours'] = float(per_traj['duration_hours'].sum())
+            metrics['trajectory_details'] = per_traj.rename_axis('taxi_id').reset_index().to_dict('records')
             
             return metrics
         
         except Exception as e:
             logging.error(f"Error calculating trajectory metrics: {e}")
             return {"error": str(e)}
+
+
+# Analyzer of the current worker process (set by _init_analysis_worker)
+_worker_analyzer: Optional[TrajectoryAnalyzer] = None
+
+
+def _init_analysis_worker(min_points: int, stop_threshold: int, max_speed: float):
+    """Initialise a worker process: fresh DB connection and local analyzer."""
+    global _worker_analyzer
+    connections.close_all()
+    _worker_analyzer = TrajectoryAnalyzer(
+        min_points_per_trajectory=min_points,
+        stop_detection_threshold=stop_threshold,
+        max_speed_kmh=max_speed
+    )
+
+
+def _analyze_taxi_worker(taxi_id: str, date: Optional[datetime]) -> Dict:
+    """Worker entry point: analyze one taxi."""
+    return _worker_analyzer._analyze_one(taxi_id, date)
@@ -8,10 +8,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from django.db import transaction
 from django.db.models import Count, Min, Max, Avg, Sum, Q
-from django.contrib.gis.geos import Polygon
+from django.contrib.gis.geos import Point, Polygon
 from django.shortcuts import get_object_or_404
 import logging
+import os
 
 from apps.mobility.models import (
     Dataset,
@@ -26,6 +28,7 @@ from apps.mobility.serializers import (
     GPSPointGeoJSONSerializer,
     GPSPointListSerializer,
     GPSPointCreateSerializer,
+    GPSPointBulkItemSerializer,
     TrajectoryGeoJSONSerializer,
     TrajectoryListSerializer,
     ImportJobSerializer,
@@ -211,6 +214,9 @@ class GPSPointViewSet(viewsets.ModelViewSet):
     """
     queryset = GPSPoint.objects.all()
     serializer_class = GPSPointGeoJSONSerializer
+    
+    # Rows per multi-row INSERT in bulk_create (bounds statement size and memory)
+    BULK_BATCH_SIZE = int(os.getenv('GPS_BULK_BATCH_SIZE', '1000'))
     pagination_class = StandardPagination
     
     def get_serializer_class(self):
@@ -397,10 +403,35 @@ class GPSPointViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        return Response(
-            {'error': 'Bulk creation not yet implemented'},
-            status=status.HTTP_501_NOT_IMPLEMENTED
-        )
+        serializer = GPSPointBulkItemSerializer(data=points_data, many=True)
+        if not serializer.is_valid():
+            return Response(
+                {'error': 'Invalid points', 'details': serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # bulk_create bypasses GPSPoint.save(), so build geom here
+        objs = [
+            GPSPoint(
+                dataset=dataset,
+                geom=Point(point['longitude'], point['latitude'], srid=4326),
+                **point
+            )
+            for point in serializer.validated_data
+        ]
+        
+        # Duplicates are skipped by the uniq_gps_point constraint
+        with transaction.atomic():
+            GPSPoint.objects.bulk_create(
+                objs,
+                batch_size=self.BULK_BATCH_SIZE,
+                ignore_conflicts=True
+            )
+        
+        return Response({
+            'dataset_id': str(dataset.id),
+            'submitted_points': len(objs)
+        }, status=status.HTTP_201_CREATED)
 
 
 # ============================================================================
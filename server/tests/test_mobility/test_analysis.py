@@ -0,0 +1,215 @@
+"""
+============================================================================
+Test Cases for Trajectory Analysis
+============================================================================
+File: server/tests/test_mobility/test_analysis.py
+Description: Tests for trajectory metrics, stop detection and OD extraction
+============================================================================
+"""
+
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.mobility.models import TDriveRawPoint, TDriveTrajectory
+from apps.mobility.services import _kernels, trajectory_analyzer
+from apps.mobility.services.od_analyzer import ODAnalyzer
+from apps.mobility.services.trajectory_analyzer import (
+    TrajectoryAnalyzer,
+    SKMOB_AVAILABLE,
+    _as_traj_dataframe,
+    _detect_stops_fast
+)
+
+
+class QuickMetricsTestCase(TestCase):
+    """Test database-side metrics against the full analysis."""
+    
+    def setUp(self):
+        """Create a taxi moving around central Beijing."""
+        self.analyzer = TrajectoryAnalyzer()
+        start = timezone.make_aware(datetime(2008, 2, 2, 13, 0, 0))
+        rng = np.random.default_rng(42)
+        lat = 39.9 + rng.normal(0, 0.02, 60)
+        lng = 116.4 + rng.normal(0, 0.03, 60)
+        # Repeated location: number_of_locations counts it once
+        lat[1], lng[1] = lat[0], lng[0]
+        
+        TDriveRawPoint.objects.bulk_create([
+            TDriveRawPoint(
+                taxi_id='1',
+                timestamp=start + timedelta(minutes=i),
+                longitude=float(lng[i]),
+                latitude=float(lat[i])
+            )
+            for i in range(60)
+        ])
+        self.lat = lat
+        self.lng = lng
+        self.start = start
+    
+    def test_quick_metrics_keys(self):
+        """Test quick metrics expose the full analysis metric keys."""
+        with patch.object(trajectory_analyzer, '_read_database', return_value='default'):
+            metrics = self.analyzer.quick_metrics('1')
+        
+        self.assertEqual(metrics['total_points'], 60)
+        self.assertEqual(metrics['number_of_locations'], 59)
+        self.assertAlmostEqual(metrics['duration_hours'], 59 / 60)
+        self.assertAlmostEqual(metrics['max_latitude'], self.lat.max())
+        self.assertAlmostEqual(metrics['min_longitude'], self.lng.min())
+    
+    def test_quick_metrics_unknown_taxi(self):
+        """Test quick metrics for a taxi without points."""
+        with patch.object(trajectory_analyzer, '_read_database', return_value='default'):
+            metrics = self.analyzer.quick_metrics('999')
+        
+        self.assertIn('error', metrics)
+    
+    @unittest.skipUnless(SKMOB_AVAILABLE, "scikit-mobility not available")
+    def test_radius_of_gyration_matches_full_analysis(self):
+        """Test the SQL radius of gyration agrees with the in-memory one."""
+        with patch.object(trajectory_analyzer, '_read_database', return_value='default'):
+            quick = self.analyzer.quick_metrics('1')
+        
+        df = pd.DataFrame({
+            'datetime': pd.date_range(self.start, periods=60, freq='min'),
+            'lng': self.lng,
+            'lat': self.lat
+        })
+        full = self.analyzer._calculate_mobility_metrics(_as_traj_dataframe(df), '1')
+        
+        self.assertGreater(quick['radius_of_gyration_km'], 0)
+        self.assertAlmostEqual(
+            quick['radius_of_gyration_km'],
+            full['radius_of_gyration_km'],
+            delta=1e-6 * full['radius_of_gyration_km']
+        )
+
+
+class StopDetectionTestCase(SimpleTestCase):
+    """Test the diameter-based stop scan on a synthetic track."""
+    
+    # Dwell jitter (degrees of latitude): ~33 m steps, ~67 m diameter
+    JITTER = (0.0, 0.0003, 0.0006, 0.0003)
+    
+    def setUp(self):
+        """Build dwell A (0-9), a drive (10-19) and dwell B (20-31) with a GPS jump at 25."""
+        lat = np.empty(32)
+        for i in range(10):
+            lat[i] = 39.90 + self.JITTER[i % 4]
+        for i in range(10, 20):
+            lat[i] = 39.91 + 0.01 * (i - 10)
+        for i in range(20, 32):
+            lat[i] = 40.01 + self.JITTER[i % 4]
+        lat[25] = 40.06
+        
+        self.lat = lat
+        self.lng = np.full(32, 116.40)
+        self.t = np.arange(32, dtype=np.int64) * 60
+    
+    def detect(self):
+        return _detect_stops_fast(self.lat, self.lng, self.t, ds=0.2, dt=300)
+    
+    def assert_expected_stops(self, result):
+        start, end, stop_lat, stop_lng = result
+        # The jump is skipped, so dwell B is not split into two short windows
+        np.testing.assert_array_equal(start, [0, 20])
+        np.testing.assert_array_equal(end, [9, 31])
+        np.testing.assert_allclose(stop_lat, [39.9003, 40.0103])
+        np.testing.assert_allclose(stop_lng, [116.40, 116.40])
+    
+    def test_detect_stops(self):
+        """Test stop windows and medoids on the default path."""
+        self.assert_expected_stops(self.detect())
+    
+    def test_detect_stops_numpy(self):
+        """Test stop windows and medoids on the NumPy fallback."""
+        with patch.object(_kernels, 'NUMBA_AVAILABLE', False):
+            self.assert_expected_stops(self.detect())
+    
+    def test_out_and_back_trip_keeps_both_stops(self):
+        """Test sparse drive samples still separate two waits at the same stand."""
+        lat = np.empty(29)
+        for i in range(10):
+            lat[i] = 39.90 + self.JITTER[i % 4]
+        # ~1.1 km between samples: out to 39.95, then back to the stand
+        for i in range(10, 15):
+            lat[i] = 39.91 + 0.01 * (i - 10)
+        for i in range(15, 19):
+            lat[i] = 39.94 - 0.01 * (i - 15)
+        for i in range(19, 29):
+            lat[i] = 39.90 + self.JITTER[i % 4]
+        lng = np.full(29, 116.40)
+        t = np.arange(29, dtype=np.int64) * 60
+        
+        for numba_available in (_kernels.NUMBA_AVAILABLE, False):
+            with patch.object(_kernels, 'NUMBA_AVAILABLE', numba_available):
+                start, end, stop_lat, _ = _detect_stops_fast(lat, lng, t, ds=0.2, dt=300)
+            
+            np.testing.assert_array_equal(start, [0, 19])
+            np.testing.assert_array_equal(end, [9, 28])
+            np.testing.assert_allclose(stop_lat, [39.9003, 39.9003])
+    
+    @unittest.skipUnless(_kernels.NUMBA_AVAILABLE, "numba not available")
+    def test_numba_matches_numpy(self):
+        """Test the compiled kernel and the NumPy scan agree."""
+        compiled = self.detect()
+        with patch.object(_kernels, 'NUMBA_AVAILABLE', False):
+            fallback = self.detect()
+        
+        for a, b in zip(compiled, fallback):
+            np.testing.assert_allclose(a, b)
+
+
+class ODExtractionTestCase(TestCase):
+    """Test batched OD extraction against the per-trajectory queries."""
+    
+    def setUp(self):
+        """Create two taxis over two days; taxi 2 has a single point on day 2."""
+        self.analyzer = ODAnalyzer()
+        points = []
+        for taxi_id, day, count in (('1', 2, 5), ('1', 3, 4), ('2', 2, 6), ('2', 3, 1)):
+            start = timezone.make_aware(datetime(2008, 2, day, 8, int(taxi_id) * 7, 0))
+            for i in range(count):
+                points.append(TDriveRawPoint(
+                    taxi_id=taxi_id,
+                    timestamp=start + timedelta(minutes=13 * i),
+                    longitude=116.30 + 0.01 * i + 0.1 * day,
+                    latitude=39.80 + 0.02 * i + 0.1 * int(taxi_id)
+                ))
+        # Invalid points are ignored by both extractions
+        points.append(TDriveRawPoint(
+            taxi_id='1',
+            timestamp=timezone.make_aware(datetime(2008, 2, 2, 6, 0, 0)),
+            longitude=121.47,
+            latitude=31.23,
+            is_valid=False
+        ))
+        TDriveRawPoint.objects.bulk_create(points)
+        
+        self.trajectories = [
+            TDriveTrajectory(taxi_id=taxi_id, trajectory_date=date(2008, 2, day))
+            for taxi_id in ('1', '2') for day in (2, 3)
+        ]
+    
+    def test_batch_matches_per_trajectory(self):
+        """Test both extractions produce the same OD columns."""
+        batched = self.analyzer._new_od_columns()
+        with self.assertNumQueries(3):
+            self.analyzer._extract_od_batch(self.trajectories, batched)
+        
+        per_trajectory = self.analyzer._new_od_columns()
+        for traj in self.trajectories:
+            self.analyzer._extract_od_from_trajectory(traj, per_trajectory)
+        
+        self.assertEqual(batched, per_trajectory)
+        self.assertEqual(batched['taxi_id'], ['1', '1', '2'])
+        self.assertEqual(batched['point_count'], [5, 4, 6])
+        self.assertEqual(batched['trip_duration_minutes'], [52.0, 39.0, 65.0])
@@ -314,6 +314,60 @@ class GPSPointAPITestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 3)
+    
+    def test_bulk_create_points(self):
+        """Test bulk creation of points in one request."""
+        url = reverse('mobility:gpspoint-bulk-create')
+        base_time = timezone.now() + timedelta(days=1)
+        
+        points = [
+            {
+                'entity_id': 'bulk_entity',
+                'timestamp': (base_time + timedelta(seconds=i)).isoformat(),
+                'longitude': 116.3 + i * 0.001,
+                'latitude': 39.9 + i * 0.001,
+                'speed': 10.0
+            }
+            for i in range(5)
+        ]
+        
+        response = self.client.post(url, {
+            'dataset': str(self.dataset.id),
+            'points': points
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['submitted_points'], 5)
+        
+        created = GPSPoint.objects.filter(dataset=self.dataset, entity_id='bulk_entity')
+        self.assertEqual(created.count(), 5)
+        self.assertFalse(created.filter(geom__isnull=True).exists())
+        
+        # Re-sending the same points is ignored by the unique constraint
+        response = self.client.post(url, {
+            'dataset': str(self.dataset.id),
+            'points': points
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(created.count(), 5)
+    
+    def test_bulk_create_invalid_points(self):
+        """Test bulk creation rejects out-of-range coordinates."""
+        url = reverse('mobility:gpspoint-bulk-create')
+        
+        response = self.client.post(url, {
+            'dataset': str(self.dataset.id),
+            'points': [{
+                'entity_id': 'bulk_entity',
+                'timestamp': timezone.now().isoformat(),
+                'longitude': 200.0,
+                'latitude': 39.9
+            }]
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(GPSPoint.objects.filter(entity_id='bulk_entity').exists())
 
 
 class TrajectoryAPITestCase(APITestCase):
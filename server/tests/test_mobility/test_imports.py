@@ -24,13 +24,18 @@ from apps.mobility.models import (
     GPSPoint,
     Trajectory,
     ImportJob,
-    ValidationError
+    ValidationError,
+    TDriveRawPoint,
+    TDriveImportLog,
+    TDriveValidationError
 )
 from apps.mobility.services.generic_importer import (
     MobilityDataImporter,
     DataValidator,
-    TDriveImporter
+    TDriveImporter,
+    _PointBatch
 )
+from apps.mobility.services import tdrive_importer
 
 
 class DatasetModelTestCase(TestCase):
@@ -256,6 +261,30 @@ class DataValidatorTestCase(TestCase):
         self.assertIn('longitude', result['parsed_data'])
         self.assertIn('latitude', result['parsed_data'])
         self.assertIn('timestamp', result['parsed_data'])
+    
+    def test_validate_chunk(self):
+        """Test vectorized validation of a chunk of rows."""
+        import pandas as pd
+        
+        chunk = pd.DataFrame({
+            'entity_id': ['taxi_1', 'taxi_1', 'taxi_2', 'taxi_3'],
+            'timestamp': [
+                '2024-01-15 08:30:00',
+                '15/01/2024 08:35:00',
+                'invalid-date',
+                '2024-01-15 08:40:00'
+            ],
+            'longitude': ['116.40734', '116.41234', '116.40734', '120.0'],
+            'latitude': ['39.90469', '39.90569', '39.90469', '35.0']
+        })
+        
+        mask, parsed, errors = self.validator.validate_chunk(chunk)
+        
+        self.assertEqual(mask.tolist(), [True, True, False, False])
+        self.assertEqual(parsed.loc[1, 'timestamp'], datetime(2024, 1, 15, 8, 35))
+        self.assertEqual(list(errors.index), [2, 3])
+        self.assertIn('Unable to parse timestamp', errors.loc[2, 'error'])
+        self.assertIn('outside allowed bounds', errors.loc[3, 'error'])
 
 
 class MobilityDataImporterTestCase(TransactionTestCase):
@@ -447,6 +476,28 @@ class MobilityDataImporterTestCase(TransactionTestCase):
             os.unlink(temp_path)
 
 
+    def test_bulk_save_isolates_bad_row(self):
+        """Test a failing row falls back to per-row inserts without failing the batch."""
+        self.importer.create_import_job('file', 'bulk_fallback.txt')
+        base_time = timezone.now()
+        
+        batch = _PointBatch(10)
+        for i in range(3):
+            batch.append(f'entity_{i}', base_time + timedelta(minutes=i),
+                         116.40734, 39.90469, record_number=i + 1)
+        # entity_id longer than max_length (100): the bulk INSERT fails
+        batch.append('x' * 150, base_time, 116.40734, 39.90469, record_number=4)
+        
+        successful, failed = self.importer._bulk_save_points(batch)
+        
+        self.assertEqual((successful, failed), (3, 1))
+        self.assertEqual(GPSPoint.objects.filter(dataset=self.dataset).count(), 3)
+        
+        error = ValidationError.objects.get(import_job=self.importer.import_job)
+        self.assertEqual(error.record_number, 4)
+        self.assertEqual(error.error_type, 'database_error')
+
+
 class TDriveImporterTestCase(TransactionTestCase):
     """Test T-Drive specific importer."""
     
@@ -502,6 +553,167 @@ class TDriveImporterTestCase(TransactionTestCase):
             os.unlink(temp_path)
 
 
+class TDriveFileImportTestCase(TransactionTestCase):
+    """Test T-Drive file import (services.tdrive_importer)."""
+    
+    LINES = [
+        '1,2008-02-02 13:30:39,116.51172,39.92123',  # valid
+        '1,2008-02-02 13:31:39,200.0,39.92123',      # longitude out of range
+        '1,2008-02-02 13:32:39,121.47,31.23',        # outside Beijing bbox
+        '1,2008-02-30 25:00:00,116.51172,39.92123',  # malformed timestamp
+    ]
+    
+    def setUp(self):
+        """Write a T-Drive file for taxi 1."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, '1.txt')
+        with open(self.file_path, 'w') as f:
+            f.write('\n'.join(self.LINES) + '\n')
+    
+    def tearDown(self):
+        """Remove the T-Drive file and the imported rows."""
+        os.unlink(self.file_path)
+        os.rmdir(self.temp_dir)
+        
+        # Unmanaged tables are not flushed between TransactionTestCase tests
+        TDriveValidationError.objects.all().delete()
+        TDriveImportLog.objects.all().delete()
+        TDriveRawPoint.objects.all().delete()
+    
+    def import_file(self, strict, use_pandas):
+        importer = tdrive_importer.TDriveImporter(strict_validation=strict)
+        result = importer.import_file(self.file_path, use_pandas=use_pandas)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['total_lines'], 4)
+        errors = list(
+            TDriveValidationError.objects
+            .filter(import_log_id=result['log_id'])
+            .order_by('line_number')
+            .values_list('line_number', 'error_type', 'error_message')
+        )
+        return result, errors
+    
+    def assert_points(self, expected):
+        """Compare stored (is_valid, validation_notes) pairs in timestamp order."""
+        points = TDriveRawPoint.objects.filter(taxi_id='1').order_by('timestamp')
+        self.assertEqual(
+            [(p.is_valid, p.validation_notes or None) for p in points],
+            expected
+        )
+    
+    def stored_timestamps(self):
+        return list(
+            TDriveRawPoint.objects.filter(taxi_id='1')
+            .order_by('timestamp')
+            .values_list('timestamp', flat=True)
+        )
+    
+    def test_copy_matches_orm_timestamps_line_by_line(self):
+        """Test COPY and the bulk_create fallback store the same instants."""
+        self.import_file(strict=False, use_pandas=False)
+        copied = self.stored_timestamps()
+        TDriveRawPoint.objects.all().delete()
+        
+        with patch.object(
+            tdrive_importer.TDriveImporter,
+            '_copy_insert_points',
+            side_effect=RuntimeError('COPY disabled')
+        ):
+            self.import_file(strict=False, use_pandas=False)
+        
+        self.assertEqual(copied, self.stored_timestamps())
+        self.assertEqual(copied[0], timezone.make_aware(datetime(2008, 2, 2, 13, 30, 39)))
+    
+    def test_copy_matches_orm_timestamps_pandas(self):
+        """Test the DataFrame COPY and the bulk_create fallback store the same instants."""
+        self.import_file(strict=False, use_pandas=True)
+        copied = self.stored_timestamps()
+        TDriveRawPoint.objects.all().delete()
+        
+        importer_class = tdrive_importer.TDriveImporter
+        with patch.object(importer_class, '_copy_insert_frame', return_value=False), \
+                patch.object(importer_class, '_copy_insert_points', side_effect=RuntimeError('COPY disabled')):
+            self.import_file(strict=False, use_pandas=True)
+        
+        self.assertEqual(copied, self.stored_timestamps())
+        self.assertEqual(copied[0], timezone.make_aware(datetime(2008, 2, 2, 13, 30, 39)))
+    
+    def test_import_strict_line_by_line(self):
+        """Test strict mode rejects every invalid line."""
+        result, errors = self.import_file(strict=True, use_pandas=False)
+        
+        self.assertEqual(result['successful'], 1)
+        self.assertEqual(result['failed'], 3)
+        self.assert_points([(True, None)])
+        self.assertEqual(errors, [
+            (2, 'VALIDATION_ERROR',
+             'Longitude 200.0 out of range; Longitude 200.0 outside Beijing bbox'),
+            (3, 'VALIDATION_ERROR',
+             'Longitude 121.47 outside Beijing bbox; Latitude 31.23 outside Beijing bbox'),
+            (4, 'TIMESTAMP_ERROR', 'Invalid timestamp format: 2008-02-30 25:00:00'),
+        ])
+    
+    def test_import_ignores_extra_fields(self):
+        """Test fields after the latitude are ignored, as with csv.reader."""
+        with open(self.file_path, 'w') as f:
+            f.write('\n'.join(line + ',0' for line in self.LINES) + '\n')
+        
+        result, errors = self.import_file(strict=True, use_pandas=False)
+        
+        self.assertEqual(result['successful'], 1)
+        self.assertEqual(result['failed'], 3)
+        self.assert_points([(True, None)])
+        self.assertEqual(
+            [error_type for _, error_type, _ in errors],
+            ['VALIDATION_ERROR', 'VALIDATION_ERROR', 'TIMESTAMP_ERROR']
+        )
+    
+    def test_import_permissive_line_by_line(self):
+        """Test permissive mode keeps out-of-bounds points as invalid."""
+        result, errors = self.import_file(strict=False, use_pandas=False)
+        
+        self.assertEqual(result['successful'], 3)
+        self.assertEqual(result['failed'], 1)
+        self.assert_points([
+            (True, None),
+            (False, 'Longitude 200.0 out of range; Longitude 200.0 outside Beijing bbox'),
+            (False, 'Longitude 121.47 outside Beijing bbox; Latitude 31.23 outside Beijing bbox'),
+        ])
+        self.assertEqual(errors, [
+            (4, 'TIMESTAMP_ERROR', 'Invalid timestamp format: 2008-02-30 25:00:00'),
+        ])
+    
+    def test_import_strict_pandas(self):
+        """Test strict mode on the pandas path."""
+        result, errors = self.import_file(strict=True, use_pandas=True)
+        
+        self.assertEqual(result['method'], 'pandas')
+        self.assertEqual(result['successful'], 1)
+        self.assertEqual(result['failed'], 3)
+        self.assert_points([(True, None)])
+        self.assertEqual(errors, [
+            (2, 'VALIDATION_ERROR', 'Longitude out of range'),
+            (3, 'VALIDATION_ERROR', 'Longitude outside Beijing bbox'),
+            (4, 'VALIDATION_ERROR', 'Invalid timestamp'),
+        ])
+    
+    def test_import_permissive_pandas(self):
+        """Test permissive mode on the pandas path rejects unparseable timestamps."""
+        result, errors = self.import_file(strict=False, use_pandas=True)
+        
+        self.assertEqual(result['successful'], 3)
+        self.assertEqual(result['failed'], 1)
+        self.assert_points([
+            (True, None),
+            (False, 'Longitude out of range'),
+            (False, 'Longitude outside Beijing bbox'),
+        ])
+        self.assertEqual(errors, [
+            (4, 'VALIDATION_ERROR', 'Invalid timestamp'),
+        ])
+
+
 class ImportJobModelTestCase(TestCase):
     """Test ImportJob model functionality."""
     